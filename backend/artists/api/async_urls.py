@@ -0,0 +1,10 @@
+from django.urls import path
+from .async_views import AsyncArtistSearchView, AsyncArtistAutocompleteView, AsyncArtistListView, AsyncArtistDetailView
+
+urlpatterns = [
+    path('artists/', AsyncArtistListView.as_view(), name='async-artist-list'),
+    path('artists/<int:id>/', AsyncArtistDetailView.as_view(), name='async-artist-detail'),
+
+    path('artists/search/', AsyncArtistSearchView.as_view(), name='async-artist-search'),
+    path('artists/autocomplete/', AsyncArtistAutocompleteView.as_view(), name='async-artist-autocomplete'),
+]
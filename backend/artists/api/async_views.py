@@ -0,0 +1,172 @@
+# async_views.py
+# Async counterparts of the views in views.py for the ASGI stack. They use
+# the async Elasticsearch client and the async ORM so a single worker can
+# keep many requests in flight without a thread per request.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.views import View
+from elasticsearch_dsl import AsyncMultiSearch, AsyncSearch, async_connections
+from rest_framework.utils.urls import replace_query_param
+from ..autocomplete import get_prefix_index, prefix_backend_enabled, prefix_index_ready
+from ..cache import get_detail_cache, get_result_cache
+from ..documents import ArtistDocument
+from ..db_routers import replica_reads
+from ..models import Artist
+from .http import (
+    ARTIST_DETAIL_CACHE_CONTROL,
+    ARTIST_LIST_CACHE_CONTROL,
+    AUTOCOMPLETE_CACHE_CONTROL,
+    apply_http_caching,
+)
+from .pagination import (
+    ArtistCursorPagination,
+    decode_cursor,
+    encode_cursor,
+    get_page_size,
+    keyset_queryset,
+    row_position,
+)
+from .search import (
+    SEARCH_MAX_PAGE_SIZE,
+    SEARCH_PAGE_SIZE,
+    build_completion_search,
+    build_prefix_search,
+    build_query_search,
+    decode_search_cursor,
+    merge_suggestions,
+    prefix_suggestions,
+    search_payload,
+)
+from .serializers import ARTIST_ROW_FIELDS, serialize_artist_row, serialize_artist_rows
+
+ASYNC_ES_ALIAS = 'async'
+
+
+def _async_search():
+    # The async client is created lazily so it binds to the running event loop
+    try:
+        async_connections.get_connection(ASYNC_ES_ALIAS)
+    except KeyError:
+        async_connections.create_connection(alias=ASYNC_ES_ALIAS, **settings.ELASTICSEARCH_DSL['default'])
+    return AsyncSearch(using=ASYNC_ES_ALIAS, index=ArtistDocument._index._name)
+
+
+class AsyncArtistSearchView(View):
+    async def get(self, request):
+        query = request.GET.get('query', '')
+        if not query:
+            return JsonResponse({"results": [], "correction": None})
+
+        limit = get_page_size(request.GET, SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE)
+        cursor = request.GET.get('cursor')
+        try:
+            after = decode_search_cursor(cursor) if cursor else None
+        except ValueError:
+            return JsonResponse({"detail": "Invalid cursor"}, status=404)
+
+        payload, cache_tier = await get_result_cache().aget_or_compute(
+            'search', query, lambda: self._search(query, limit, after), variant=f"{limit}:{cursor or ''}"
+        )
+        response = JsonResponse(payload)
+        response['X-Cache'] = cache_tier
+        response['X-ES-Calls'] = '0' if cache_tier != 'miss' else '1'
+        return response
+
+    async def _search(self, query, limit, after=None):
+        search, expanded_query = build_query_search(_async_search(), query, limit, after)
+        return search_payload(await search.execute(), limit, expanded_query, after)
+
+
+class AsyncArtistAutocompleteView(View):
+    async def get(self, request):
+        response = await self._get(request)
+        return apply_http_caching(request, response, AUTOCOMPLETE_CACHE_CONTROL, ('Accept', 'Accept-Encoding'))
+
+    async def _get(self, request):
+        query = request.GET.get('query', '')
+        if not query:
+            return JsonResponse([], safe=False)
+
+        if prefix_backend_enabled():
+            # Building the index from Postgres on first use and re-reading a
+            # newer snapshot are blocking; keep both off the event loop
+            index = get_prefix_index() if prefix_index_ready() else await sync_to_async(get_prefix_index)()
+            response = JsonResponse(prefix_suggestions(index, query), safe=False)
+            response['X-ES-Calls'] = '0'
+            return response
+
+        suggestions, cache_tier = await get_result_cache().aget_or_compute(
+            'autocomplete', query, lambda: self._suggest(query)
+        )
+        response = JsonResponse(suggestions, safe=False)
+        response['X-Cache'] = cache_tier
+        response['X-ES-Calls'] = '0' if cache_tier != 'miss' else '1'
+        return response
+
+    async def _suggest(self, query):
+        multi_search = AsyncMultiSearch(using=ASYNC_ES_ALIAS, index=ArtistDocument._index._name)
+        multi_search = multi_search.add(build_completion_search(_async_search(), query))
+        multi_search = multi_search.add(build_prefix_search(_async_search(), query))
+        suggest_response, search_response = await multi_search.execute()
+
+        return merge_suggestions(suggest_response, search_response)
+
+
+class AsyncArtistListView(View):
+    async def get(self, request):
+        with replica_reads():
+            response = await self._get(request)
+        return apply_http_caching(request, response, ARTIST_LIST_CACHE_CONTROL)
+
+    async def _get(self, request):
+        # Same cursor/limit parameters and payload shape as ArtistCursorPagination
+        pagination = ArtistCursorPagination
+        limit = get_page_size(request.GET, pagination.page_size, pagination.max_page_size,
+                              pagination.page_size_query_param)
+
+        position = None
+        cursor = request.GET.get(pagination.cursor_query_param)
+        if cursor:
+            try:
+                position = decode_cursor(cursor)
+            except ValueError:
+                return JsonResponse({"detail": "Invalid cursor"}, status=404)
+
+        queryset = keyset_queryset(Artist.objects.values(*ARTIST_ROW_FIELDS), position)
+        rows = [row async for row in queryset[:limit + 1]]
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        next_url = None
+        if has_next:
+            next_cursor = encode_cursor(*row_position(rows[-1]))
+            next_url = replace_query_param(request.build_absolute_uri(), pagination.cursor_query_param, next_cursor)
+
+        return JsonResponse({
+            "next": next_url,
+            "next_cursor": next_cursor,
+            "has_next": has_next,
+            "results": serialize_artist_rows(rows),
+        })
+
+
+class AsyncArtistDetailView(View):
+    async def get(self, request, id):
+        with replica_reads():
+            response = await self._get(request, id)
+        return apply_http_caching(request, response, ARTIST_DETAIL_CACHE_CONTROL)
+
+    async def _get(self, request, id):
+        payload = await get_detail_cache().aget_or_load(id, lambda from_primary: self._load(id, from_primary))
+        if payload is None:
+            return JsonResponse({"detail": "No Artist matches the given query."}, status=404)
+
+        return JsonResponse(payload)
+
+    async def _load(self, id, from_primary=False):
+        # Replica unless written moments ago, see ArtistDetailView._load
+        queryset = Artist.objects.using('default') if from_primary else Artist.objects
+        row = await queryset.values(*ARTIST_ROW_FIELDS).filter(id=id).afirst()
+        return serialize_artist_row(row) if row is not None else None
@@ -0,0 +1,40 @@
+# http.py
+# Conditional GET support (ETag / 304) and per-endpoint Cache-Control
+# policies, shared by the DRF views and their async counterparts.
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, set_response_etag
+
+ARTIST_DETAIL_CACHE_CONTROL = {'public': True, 'max_age': 300, 'stale_while_revalidate': 60}
+ARTIST_LIST_CACHE_CONTROL = {'public': True, 'max_age': 60}
+AUTOCOMPLETE_CACHE_CONTROL = {'public': True, 'max_age': 30}
+
+
+def apply_http_caching(request, response, cache_control, vary=()):
+    """
+    Tag a successful GET response with an ETag over its rendered body and
+    the given Cache-Control policy, answering 304 Not Modified when the
+    client already holds that representation
+    """
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return response
+
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+
+    set_response_etag(response)
+    patch_cache_control(response, **cache_control)
+    if vary:
+        patch_vary_headers(response, vary)
+
+    return get_conditional_response(request, etag=response.get('ETag'), response=response)
+
+
+class HttpCachingMixin:
+    """
+    DRF view mixin applying ``cache_control`` and ``vary_headers`` through apply_http_caching()
+    """
+    cache_control = {}
+    vary_headers = ()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        return apply_http_caching(request, response, self.cache_control, self.vary_headers)
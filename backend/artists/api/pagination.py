@@ -0,0 +1,108 @@
+# pagination.py
+import base64
+import binascii
+from django.db.models import BooleanField, ExpressionWrapper
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# Rows are ordered by (popularity DESC, id DESC). Both keys run in the same
+# direction so the position can be expressed as a single row comparison,
+# which Postgres turns into an index bound on artists_artist(popularity, id)
+# instead of scanning every tie at the same popularity.
+KEYSET_ORDERING = ('-popularity', '-id')
+
+
+def encode_cursor(popularity, artist_id):
+    return base64.urlsafe_b64encode(f"{popularity}:{artist_id}".encode('ascii')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Return the (popularity, id) position encoded in ``cursor``, raising
+    ValueError if it is malformed
+    """
+    try:
+        popularity, artist_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('ascii').split(':')
+        return int(popularity), int(artist_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def row_position(row):
+    """
+    (popularity, id) of a model instance or a values() row
+    """
+    if isinstance(row, dict):
+        return row['popularity'], row['id']
+    return row.popularity, row.id
+
+
+def keyset_queryset(queryset, position=None):
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    if position is None:
+        return queryset
+    after_position = ExpressionWrapper(
+        RawSQL('("popularity", "id") < (%s, %s)', position),
+        output_field=BooleanField(),
+    )
+    return queryset.filter(after_position)
+
+
+def get_page_size(query_params, default, maximum, param='limit'):
+    try:
+        page_size = int(query_params.get(param, default))
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(page_size, maximum))
+
+
+class ArtistCursorPagination(BasePagination):
+    """
+    Keyset pagination on (popularity DESC, id DESC).
+
+    Each page is a single indexed range scan of ``limit + 1`` rows; the
+    extra row tells us whether there is a next page, so no COUNT(*) or
+    OFFSET is ever issued.
+    """
+    page_size = 12
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        limit = get_page_size(request.query_params, self.page_size, self.max_page_size, self.page_size_query_param)
+
+        position = None
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            try:
+                position = decode_cursor(cursor)
+            except ValueError:
+                raise NotFound('Invalid cursor')
+
+        rows = list(keyset_queryset(queryset, position)[:limit + 1])
+        self.has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        self.next_cursor = None
+        if self.has_next:
+            self.next_cursor = encode_cursor(*row_position(rows[-1]))
+        return rows
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+            'has_next': self.has_next,
+            'results': data,
+        })
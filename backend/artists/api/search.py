@@ -0,0 +1,286 @@
+# search.py
+# Elasticsearch query construction shared by the sync and async views.
+# Builders take a base search (ArtistDocument.search() or an AsyncSearch)
+# so the same request bodies go out on either stack.
+import base64
+import binascii
+import json
+from django.conf import settings
+from elasticsearch_dsl import Q
+from ..artist_abbreviations import ARTIST_ABBREVIATIONS
+from ..cache import normalize_query
+
+# Only the fields serialize_search_hits() reads are fetched from _source.
+SEARCH_RESULT_SOURCE = ['name', 'genre', 'profile_picture', 'location']
+# Popularity is blended into _score through popularity_boost(); search_after
+# still needs a total order, so id breaks the remaining ties.
+SEARCH_SORT = ('_score', 'id')
+# Contribution of popularity to the score: saturation(pivot) reaches half of
+# POPULARITY_BOOST at a popularity of POPULARITY_PIVOT.
+POPULARITY_BOOST = 2.0
+POPULARITY_PIVOT = 50
+SEARCH_PAGE_SIZE = 10
+SEARCH_MAX_PAGE_SIZE = 100
+MAX_BATCH_QUERIES = 500
+
+# Fields the suggestion payload needs; the completion suggester returns
+# them in each option's _source so no follow-up lookups are required.
+SUGGESTION_SOURCE = ['name', 'profile_picture', 'popularity']
+MAX_SUGGESTIONS = 10
+MIN_SUGGESTIONS = 5
+
+
+def encode_search_cursor(hit):
+    return base64.urlsafe_b64encode(json.dumps(list(hit.meta.sort)).encode('utf-8')).decode('ascii')
+
+
+def decode_search_cursor(cursor):
+    """
+    Return the search_after sort values encoded in ``cursor``, raising
+    ValueError if it is malformed
+    """
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if not isinstance(after, list) or len(after) != len(SEARCH_SORT):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return after
+
+
+def paginate_search(search, limit, after=None):
+    """
+    Restrict ``search`` to one page of ``limit`` hits after the ``after`` sort
+    values. One extra hit is requested so callers can tell if a next page exists
+    """
+    search = search.source(SEARCH_RESULT_SOURCE)
+    search = search.sort(*SEARCH_SORT)
+    search = search.extra(size=limit + 1, track_total_hits=False)
+    if after:
+        search = search.extra(search_after=after)
+    return search
+
+
+def page_results(response, limit):
+    """
+    Return ``(results, next_cursor)`` for a response fetched by paginate_search()
+    """
+    hits = list(response)
+    next_cursor = encode_search_cursor(hits[limit - 1]) if len(hits) > limit else None
+    return serialize_search_hits(hits[:limit]), next_cursor
+
+
+def build_query_search(search, query, limit, after=None):
+    """
+    Full search request for a user query, expanding known abbreviations.
+    Returns ``(search, expanded_query)``; expanded_query is None when the
+    query is not an abbreviation
+    """
+    lower_query = normalize_query(query)
+    if lower_query in ARTIST_ABBREVIATIONS:
+        expanded_query = ARTIST_ABBREVIATIONS[lower_query]
+        search = build_abbreviation_search(search, expanded_query)
+    else:
+        expanded_query = None
+        search = build_artist_search(search, query)
+        if after is None:
+            search = with_correction_suggester(search, query)
+    return paginate_search(search, limit, after), expanded_query
+
+
+def search_payload(response, limit, expanded_query=None, after=None):
+    """
+    Response body for one page of search results, as returned by ArtistSearchView
+    """
+    results, next_cursor = page_results(response, limit)
+
+    if expanded_query is not None:
+        return {
+            "results": results,
+            "correction": expanded_query,
+            "abbreviation_expanded": True,
+            "next_cursor": next_cursor,
+            "has_next": next_cursor is not None,
+        }
+
+    return {
+        "results": results,
+        # The correction suggester is only attached to the first page
+        "correction": pick_correction(response) if after is None else None,
+        "next_cursor": next_cursor,
+        "has_next": next_cursor is not None,
+    }
+
+
+def prefix_match(query, boost=1.0, prefix_mapping=None):
+    """
+    Match ``query`` as a prefix of the name against whichever prefix
+    subfield the index was built with (see artist_name_field())
+    """
+    prefix_mapping = prefix_mapping or settings.ARTIST_NAME_PREFIX_MAPPING
+    if prefix_mapping == 'search_as_you_type':
+        return Q(
+            'multi_match',
+            query=query,
+            type='bool_prefix',
+            fields=['name.prefix', 'name.prefix._2gram', 'name.prefix._3gram'],
+            boost=boost
+        )
+    return Q('match', name__edge_ngram={'query': query, 'boost': boost})
+
+
+def popularity_boost():
+    return Q(
+        'rank_feature',
+        field='popularity_rank',
+        saturation={'pivot': POPULARITY_PIVOT},
+        boost=POPULARITY_BOOST
+    )
+
+
+def with_popularity(query):
+    """
+    Require ``query`` to match and add popularity to the score of each match
+    """
+    return Q('bool', must=[query], should=[popularity_boost()])
+
+
+def build_abbreviation_search(search, expanded_query):
+    return search.query(with_popularity(Q('match', name={'query': expanded_query})))
+
+
+def build_artist_search(search, query):
+    text_query = Q(
+        'bool',
+        should=[
+            Q('term', name__raw={'value': query, 'boost': 10.0}),
+            Q('match', name={'query': query, 'boost': 5.0}),
+            prefix_match(query, boost=1.0),
+        ],
+        minimum_should_match=1
+    )
+
+    return search.query(with_popularity(text_query))
+
+
+def serialize_search_hits(response):
+    return [{
+        'id': hit.meta.id,
+        'name': hit.name,
+        'genre': getattr(hit, 'genre', ''),
+        'profile_picture': getattr(hit, 'profile_picture', ''),
+        'location': getattr(hit, 'location', ''),
+        'score': hit.meta.score
+    } for hit in response]
+
+
+def with_correction_suggester(search, query):
+    """
+    Attach a phrase suggester on ``name`` so did-you-mean corrections come
+    back in the same request. Collating against the index keeps only
+    corrections that actually match an artist
+    """
+    return search.suggest(
+        'name_correction',
+        query,
+        phrase={
+            'field': 'name',
+            'size': 1,
+            'max_errors': 2,
+            'confidence': 1.0,
+            'direct_generator': [{
+                'field': 'name',
+                'suggest_mode': 'always',
+                'min_word_length': 3,
+            }],
+            'collate': {
+                'query': {'source': {'match_phrase': {'name': '{{suggestion}}'}}},
+                'prune': False,
+            },
+        }
+    )
+
+
+def pick_correction(response):
+    """
+    The phrase suggester's correction, if it found one, in the casing of
+    the matching artist when that artist is among the hits
+    """
+    if not hasattr(response, 'suggest') or 'name_correction' not in response.suggest:
+        return None
+
+    suggestions = response.suggest.name_correction
+    if not suggestions or not suggestions[0].options:
+        return None
+
+    correction = suggestions[0].options[0].text
+    for hit in response:
+        if hit.name.lower() == correction.lower():
+            return hit.name
+    return correction
+
+
+def build_completion_search(search, query):
+    search = search.source(SUGGESTION_SOURCE)[:0]
+    return search.suggest(
+        'name_suggestions',
+        query,
+        completion={
+            'field': 'name.suggest',
+            'size': MAX_SUGGESTIONS
+        }
+    )
+
+
+def build_prefix_search(search, query):
+    search = search.source(SUGGESTION_SOURCE)
+    search = search.query(
+        with_popularity(prefix_match(query))
+    )
+    return search[:MIN_SUGGESTIONS]
+
+
+def merge_suggestions(suggest_response, search_response):
+    """
+    Completion options first, topped up to MIN_SUGGESTIONS with name prefix
+    hits, deduplicated by id and ordered by popularity
+    """
+    suggestions = []
+
+    if hasattr(suggest_response, 'suggest') and 'name_suggestions' in suggest_response.suggest:
+        for suggestion in suggest_response.suggest.name_suggestions[0].options:
+            # Options are AttrDicts, which have no .get()
+            source = suggestion._source.to_dict() if '_source' in suggestion else {}
+            suggestions.append({
+                'id': suggestion._id,
+                'name': suggestion.text,
+                'profile_picture': source.get('profile_picture'),
+                'popularity': source.get('popularity', 0),
+                'source': 'completion',
+            })
+
+    if len(suggestions) < MIN_SUGGESTIONS:
+        seen_ids = {s['id'] for s in suggestions}
+        for hit in search_response:
+            if len(suggestions) >= MIN_SUGGESTIONS:
+                break
+            if hit.meta.id in seen_ids:
+                continue
+            seen_ids.add(hit.meta.id)
+            suggestions.append({
+                'id': hit.meta.id,
+                'name': hit.name,
+                'profile_picture': getattr(hit, 'profile_picture', None),
+                'popularity': getattr(hit, 'popularity', 0),
+                'source': 'search',
+            })
+
+    suggestions.sort(key=lambda x: x.get('popularity', 0), reverse=True)
+    return suggestions
+
+
+def prefix_suggestions(index, query):
+    return [
+        {**artist, 'source': 'prefix'}
+        for artist in index.search(query, MAX_SUGGESTIONS)
+    ]
@@ -1,8 +1,38 @@
 # serializers.py
 from rest_framework import serializers
 from ..models import Artist
+from .search import MAX_BATCH_QUERIES, SEARCH_MAX_PAGE_SIZE
 
 class ArtistSerializer(serializers.ModelSerializer):
     class Meta:
         model = Artist
-        fields = ['id', 'name', 'genre', 'profile_picture', 'location', 'get_popularity']
\ No newline at end of file
+        fields = ['id', 'name', 'genre', 'profile_picture', 'location', 'get_popularity']
+
+
+# Columns read by the values()-based fast path; serialize_artist_row()
+# produces exactly the ArtistSerializer schema from them.
+ARTIST_ROW_FIELDS = ('id', 'name', 'genre', 'profile_picture', 'location', 'popularity')
+
+
+def serialize_artist_row(row):
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'genre': row['genre'],
+        'profile_picture': row['profile_picture'],
+        'location': row['location'],
+        'get_popularity': row['popularity'],
+    }
+
+
+def serialize_artist_rows(rows):
+    return [serialize_artist_row(row) for row in rows]
+
+
+class ArtistBatchSearchSerializer(serializers.Serializer):
+    queries = serializers.ListField(
+        child=serializers.CharField(allow_blank=True, trim_whitespace=False),
+        allow_empty=False,
+        max_length=MAX_BATCH_QUERIES,
+    )
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=SEARCH_MAX_PAGE_SIZE)
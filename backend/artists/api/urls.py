@@ -1,10 +1,20 @@
 from django.urls import path
-from .views import ArtistSearchView, ArtistAutocompleteView, ArtistListView, ArtistDetailView
+from .views import (
+    ArtistSearchView,
+    ArtistBatchSearchView,
+    ArtistAutocompleteView,
+    ArtistListView,
+    ArtistDetailView,
+    ArtistCacheStatsView,
+)
 
 urlpatterns = [
     path('artists/', ArtistListView.as_view(), name='artist-list'),
     path('artists/<int:id>/', ArtistDetailView.as_view(), name='artist-detail'),
 
     path('artists/search/', ArtistSearchView.as_view(), name='artist-search'),
+    path('artists/search/batch/', ArtistBatchSearchView.as_view(), name='artist-search-batch'),
     path('artists/autocomplete/', ArtistAutocompleteView.as_view(), name='artist-autocomplete'),
+
+    path('artists/cache/stats/', ArtistCacheStatsView.as_view(), name='artist-cache-stats'),
 ]
\ No newline at end of file
@@ -1,161 +1,191 @@
 # views.py
-from elasticsearch_dsl import Q
+from elasticsearch_dsl import MultiSearch
 from rest_framework import generics
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from ..documents import ArtistDocument
-from ..artist_abbreviations import ARTIST_ABBREVIATIONS
+from ..autocomplete import get_prefix_index, prefix_backend_enabled
+from ..cache import get_detail_cache, get_result_cache
 from rest_framework.generics import ListAPIView
-from rest_framework.pagination import PageNumberPagination
+from ..db_routers import ReplicaReadMixin
 from ..models import Artist
-from .serializers import ArtistSerializer
+from .http import (
+    ARTIST_DETAIL_CACHE_CONTROL,
+    ARTIST_LIST_CACHE_CONTROL,
+    AUTOCOMPLETE_CACHE_CONTROL,
+    HttpCachingMixin,
+)
+from .pagination import ArtistCursorPagination, get_page_size
+from .search import (
+    SEARCH_MAX_PAGE_SIZE,
+    SEARCH_PAGE_SIZE,
+    build_completion_search,
+    build_prefix_search,
+    build_query_search,
+    decode_search_cursor,
+    merge_suggestions,
+    prefix_suggestions,
+    search_payload,
+)
+from .renderers import ORJSONRenderer
+from .serializers import (
+    ARTIST_ROW_FIELDS,
+    ArtistBatchSearchSerializer,
+    ArtistSerializer,
+    serialize_artist_row,
+    serialize_artist_rows,
+)
 
 
-class ArtistPagination(PageNumberPagination):
-    page_size = 12
-    page_size_query_param = 'limit'
-    max_page_size = 100
-
-    def get_paginated_response(self, data):
-        response = super().get_paginated_response(data)
-        response.data['has_next'] = self.page.has_next()
-        return response
-
-class ArtistListView(ListAPIView):
-    queryset = Artist.objects.all().order_by('-popularity')
+class ArtistListView(ReplicaReadMixin, HttpCachingMixin, ListAPIView):
+    # Rows are read with values() and serialized directly, skipping model
+    # instances and DRF field objects; the schema matches ArtistSerializer.
+    queryset = Artist.objects.values(*ARTIST_ROW_FIELDS)
     serializer_class = ArtistSerializer
-    pagination_class = ArtistPagination
+    pagination_class = ArtistCursorPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    cache_control = ARTIST_LIST_CACHE_CONTROL
 
-class ArtistDetailView(generics.RetrieveAPIView):
-    queryset = Artist.objects.all()
+    def list(self, request, *args, **kwargs):
+        rows = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(serialize_artist_rows(rows))
+
+class ArtistDetailView(ReplicaReadMixin, HttpCachingMixin, generics.RetrieveAPIView):
+    queryset = Artist.objects.values(*ARTIST_ROW_FIELDS)
     serializer_class = ArtistSerializer
     lookup_field = 'id'
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    cache_control = ARTIST_DETAIL_CACHE_CONTROL
+
+    def retrieve(self, request, *args, **kwargs):
+        artist_id = self.kwargs[self.lookup_field]
+        payload = get_detail_cache().get_or_load(artist_id, lambda from_primary: self._load(artist_id, from_primary))
+        if payload is None:
+            raise NotFound('No Artist matches the given query.')
+        return Response(payload)
+
+    def _load(self, artist_id, from_primary=False):
+        queryset = self.get_queryset()
+        if from_primary:
+            # Written moments ago: a lagging replica could return the old row
+            queryset = queryset.using('default')
+        row = queryset.filter(id=artist_id).first()
+        return serialize_artist_row(row) if row is not None else None
+
+
+class ArtistCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'detail': get_detail_cache().stats(),
+            'results': get_result_cache().local.stats(),
+        })
+
 class ArtistSearchView(APIView):
     def get(self, request):
         query = request.query_params.get('query', '')
         if not query:
             return Response({"results": [], "correction": None})
         
-        lower_query = query.lower().replace(' ', '')
-        if lower_query in ARTIST_ABBREVIATIONS:
-            expanded_query = ARTIST_ABBREVIATIONS[lower_query]
-            search = ArtistDocument.search()
-            search = search.query('match', name={'query': expanded_query})
-            search = search.sort('_score', '-popularity')
-            response = search.execute()
-            
-            results = [{
-                'id': hit.meta.id,
-                'name': hit.name,
-                'genre': getattr(hit, 'genre', ''),
-                'profile_picture': getattr(hit, 'profile_picture', ''),
-                'location': getattr(hit, 'location', ''),
-                'score': hit.meta.score
-            } for hit in response]
-            
-            return Response({
-                "results": results,
-                "correction": expanded_query,
-                "abbreviation_expanded": True
-            })
-        
-        search = ArtistDocument.search()
+        limit = get_page_size(request.query_params, SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE)
+        cursor = request.query_params.get('cursor')
+        try:
+            after = decode_search_cursor(cursor) if cursor else None
+        except ValueError:
+            raise NotFound('Invalid cursor')
         
-        combined_query = Q(
-            'bool',
-            should=[
-                Q('term', name__raw={'value': query, 'boost': 10.0}),
-                Q('match', name={'query': query, 'boost': 5.0}),
-                Q('match', name={
-                    'query': query,
-                    'fuzziness': 'AUTO',
-                    'boost': 3.0
-                }),
-                Q('match', name__edge_ngram={'query': query, 'boost': 1.0}),
-            ],
-            minimum_should_match=1
+        payload, cache_tier = get_result_cache().get_or_compute(
+            'search', query, lambda: self._search(query, limit, after), variant=f"{limit}:{cursor or ''}"
         )
+        response = Response(payload)
+        response['X-Cache'] = cache_tier
+        response['X-ES-Calls'] = '0' if cache_tier != 'miss' else '1'
+        return response
+
+    def _search(self, query, limit, after=None):
+        search, expanded_query = build_query_search(ArtistDocument.search(), query, limit, after)
+        return search_payload(search.execute(), limit, expanded_query, after)
+
+
+class ArtistBatchSearchView(APIView):
+    def post(self, request):
+        serializer = ArtistBatchSearchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queries = serializer.validated_data['queries']
+        limit = serializer.validated_data.get('limit', SEARCH_PAGE_SIZE)
+        variant = f"{limit}:"
         
-        search = search.query(combined_query)
-        search = search.sort('_score', '-popularity')
-        
-        response = search.execute()
-        
-        exact_match = any(hit.meta.score > 8.0 for hit in response)
-        correction = None
+        cache = get_result_cache()
+        payloads = [None] * len(queries)
+        pending = {}
         
-        if not exact_match and len(response) > 0:
-            top_hit = response[0]
-            if top_hit.meta.score > 3.0:
-                correction = top_hit.name
+        for position, query in enumerate(queries):
+            if not query:
+                payloads[position] = {"results": [], "correction": None}
+                continue
+            cached = cache.get('search', query, variant)
+            if cached is not None:
+                payloads[position] = cached
+            else:
+                # Identical queries in one batch share a single sub-search
+                pending.setdefault(query, []).append(position)
         
-        results = [{
-            'id': hit.meta.id,
-            'name': hit.name,
-            'genre': getattr(hit, 'genre', ''),
-            'profile_picture': getattr(hit, 'profile_picture', ''),
-            'location': getattr(hit, 'location', ''),
-            'score': hit.meta.score
-        } for hit in response]
+        # Every uncached query goes out in one _msearch round trip
+        if pending:
+            multi_search = MultiSearch(index=ArtistDocument._index._name)
+            expansions = []
+            for query in pending:
+                search, expanded_query = build_query_search(ArtistDocument.search(), query, limit)
+                multi_search = multi_search.add(search)
+                expansions.append(expanded_query)
+            
+            for (query, positions), expanded_query, response in zip(pending.items(), expansions, multi_search.execute()):
+                payload = search_payload(response, limit, expanded_query)
+                cache.set('search', query, payload, variant)
+                for position in positions:
+                    payloads[position] = payload
         
-        return Response({
-            "results": results,
-            "correction": correction
+        response = Response({
+            "results": [{"query": query, **payload} for query, payload in zip(queries, payloads)]
         })
+        response['X-ES-Calls'] = '1' if pending else '0'
+        return response
 
 
-class ArtistAutocompleteView(APIView):
+class ArtistAutocompleteView(HttpCachingMixin, APIView):
+    cache_control = AUTOCOMPLETE_CACHE_CONTROL
+    # The query itself is part of the URL; these keep shared caches from
+    # mixing negotiated or compressed variants of the same suggestions
+    vary_headers = ('Accept', 'Accept-Encoding')
+
     def get(self, request):
         query = request.query_params.get('query', '')
         if not query:
             return Response([])
         
-        suggest = ArtistDocument.search()
-        suggest = suggest.suggest(
-            'name_suggestions',
-            query,
-            completion={
-                'field': 'name.suggest',
-                'size': 10
-            }
-        )
-        
-        suggest_response = suggest.execute()
-        
-        suggestions = []
-        
-        if hasattr(suggest_response, 'suggest') and 'name_suggestions' in suggest_response.suggest:
-            for suggestion in suggest_response.suggest.name_suggestions[0].options:
-                artist_doc = ArtistDocument.get(id=suggestion._id)
-                suggestions.append({
-                    'id': suggestion._id,
-                    'name': suggestion.text,
-                    'profile_picture': getattr(artist_doc, 'profile_picture', None),
-                    'popularity': getattr(artist_doc, 'popularity', 0),
-                    'source': 'completion',
-                })
+        if prefix_backend_enabled():
+            response = Response(prefix_suggestions(get_prefix_index(), query))
+            response['X-ES-Calls'] = '0'
+            return response
         
-        if len(suggestions) < 5:
-            search = ArtistDocument.search()
-            search = search.query(
-                Q('match', name__edge_ngram={'query': query})
-            )
-            
-            remaining = 5 - len(suggestions)
-            search = search[:remaining]
-            search = search.sort('-popularity')
-            
-            response = search.execute()
-            
-            for hit in response:
-                if not any(s['id'] == hit.meta.id for s in suggestions):
-                    suggestions.append({
-                        'id': hit.meta.id,
-                        'name': hit.name,
-                        'profile_picture': getattr(hit, 'profile_picture', None),
-                        'popularity': getattr(hit, 'popularity', 0),
-                        'source': 'search',
-                    })
+        suggestions, cache_tier = get_result_cache().get_or_compute(
+            'autocomplete', query, lambda: self._suggest(query)
+        )
+        response = Response(suggestions)
+        response['X-Cache'] = cache_tier
+        response['X-ES-Calls'] = '0' if cache_tier != 'miss' else '1'
+        return response
+
+    def _suggest(self, query):
+        # Completion and name prefix fallback go out together in a single
+        # _msearch so sparse prefixes still cost one round trip.
+        multi_search = MultiSearch(index=ArtistDocument._index._name)
+        multi_search = multi_search.add(build_completion_search(ArtistDocument.search(), query))
+        multi_search = multi_search.add(build_prefix_search(ArtistDocument.search(), query))
+        suggest_response, search_response = multi_search.execute()
         
-        suggestions.sort(key=lambda x: x.get('popularity', 0), reverse=True)
-        return Response(suggestions)
\ No newline at end of file
+        return merge_suggestions(suggest_response, search_response)
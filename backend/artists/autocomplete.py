@@ -0,0 +1,314 @@
+import bisect
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\w+')
+
+# (name, profile_picture, popularity)
+ArtistRow = Tuple[str, Optional[str], int]
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercase, strip accents and collapse whitespace so that prefixes typed
+    by users line up with the stored artist names
+    """
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    return _WHITESPACE_RE.sub(' ', name.lower()).strip()
+
+
+def name_keys(name: str) -> Set[str]:
+    """
+    Keys an artist is reachable under: the full normalized name plus the
+    remainder starting at every later word, so "beat" finds "The Beatles"
+    just like the edge n-gram field does
+    """
+    normalized = normalize_name(name)
+    if not normalized:
+        return set()
+    return {normalized[match.start():] for match in _WORD_RE.finditer(normalized)} | {normalized}
+
+
+class PrefixIndex:
+    """
+    In-memory autocomplete index over artist names.
+
+    Keys are kept in a sorted array and searched with bisect. For short
+    prefixes (up to ``precomputed_depth`` characters), which match the
+    largest ranges, the top-k artists by popularity are precomputed so
+    lookups are a single dict access.
+    """
+
+    def __init__(self, top_k: int = 10, precomputed_depth: int = 3, snapshot_path: Optional[str] = None,
+                 reload_interval: float = 60):
+        self.top_k = top_k
+        self.precomputed_depth = precomputed_depth
+        self.snapshot_path = snapshot_path
+        self.reload_interval = reload_interval
+
+        self._lock = threading.RLock()
+        self._artists: Dict[int, ArtistRow] = {}
+        self._keys: List[Tuple[str, int]] = []
+        self._top: Dict[str, List[int]] = {}
+
+        self._snapshot_mtime = None
+        self._last_reload_check = 0.0
+
+    def __len__(self) -> int:
+        return len(self._artists)
+
+    def _popularity(self, artist_id: int) -> int:
+        return self._artists[artist_id][2] or 0
+
+    def _short_prefixes(self, key: str) -> List[str]:
+        return [key[:length] for length in range(1, min(len(key), self.precomputed_depth) + 1)]
+
+    def _scan(self, prefix: str, limit: int) -> List[int]:
+        lo = bisect.bisect_left(self._keys, (prefix,))
+        hi = bisect.bisect_left(self._keys, (prefix + '\U0010ffff',))
+        candidates = {artist_id for _, artist_id in self._keys[lo:hi]}
+        return heapq.nlargest(limit, candidates, key=self._popularity)
+
+    def load(self, rows: Iterable[Tuple[int, str, Optional[str], int]]) -> None:
+        """
+        Replace the index contents with the given (id, name, profile_picture, popularity) rows
+        """
+        artists: Dict[int, ArtistRow] = {}
+        keys: List[Tuple[str, int]] = []
+        buckets: Dict[str, Set[int]] = {}
+
+        for artist_id, name, profile_picture, popularity in rows:
+            artists[artist_id] = (name, profile_picture, popularity or 0)
+            for key in name_keys(name):
+                keys.append((key, artist_id))
+                for prefix in self._short_prefixes(key):
+                    buckets.setdefault(prefix, set()).add(artist_id)
+
+        keys.sort()
+        top = {
+            prefix: heapq.nlargest(self.top_k, ids, key=lambda i: artists[i][2])
+            for prefix, ids in buckets.items()
+        }
+
+        with self._lock:
+            self._artists = artists
+            self._keys = keys
+            self._top = top
+
+    def _refresh_top(self, prefixes: Iterable[str]) -> None:
+        for prefix in prefixes:
+            top = self._scan(prefix, self.top_k)
+            if top:
+                self._top[prefix] = top
+            else:
+                self._top.pop(prefix, None)
+
+    def _drop(self, artist_id: int) -> Set[str]:
+        row = self._artists.pop(artist_id, None)
+        if row is None:
+            return set()
+
+        affected = set()
+        for key in name_keys(row[0]):
+            position = bisect.bisect_left(self._keys, (key, artist_id))
+            if position < len(self._keys) and self._keys[position] == (key, artist_id):
+                del self._keys[position]
+            affected.update(self._short_prefixes(key))
+        return affected
+
+    def upsert(self, artist_id: int, name: str, profile_picture: Optional[str], popularity: int) -> None:
+        """
+        Add or update a single artist in place
+        """
+        with self._lock:
+            affected = self._drop(artist_id)
+            self._artists[artist_id] = (name, profile_picture, popularity or 0)
+            for key in name_keys(name):
+                bisect.insort(self._keys, (key, artist_id))
+                affected.update(self._short_prefixes(key))
+            self._refresh_top(affected)
+
+    def remove(self, artist_id: int) -> None:
+        """
+        Remove a single artist in place
+        """
+        with self._lock:
+            self._refresh_top(self._drop(artist_id))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Return up to ``limit`` artists whose name (or a word in it) starts
+        with ``query``, most popular first
+        """
+        limit = limit or self.top_k
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+
+        with self._lock:
+            if len(prefix) <= self.precomputed_depth and limit <= self.top_k:
+                artist_ids = self._top.get(prefix, [])[:limit]
+            else:
+                artist_ids = self._scan(prefix, limit)
+
+            results = []
+            for artist_id in artist_ids:
+                name, profile_picture, popularity = self._artists[artist_id]
+                results.append({
+                    'id': str(artist_id),
+                    'name': name,
+                    'profile_picture': profile_picture,
+                    'popularity': popularity,
+                })
+            return results
+
+    def load_from_database(self) -> None:
+        from .models import Artist
+
+        rows = Artist.objects.values_list('id', 'name', 'profile_picture', 'popularity')
+        self.load(rows.iterator(chunk_size=5000))
+
+    def refresh(self, artist_ids: Iterable[int], chunk_size: int = 1000) -> None:
+        """
+        Re-read the given artists from Postgres, upserting the ones that
+        exist and removing the rest
+        """
+        from .models import Artist
+
+        artist_ids = list(artist_ids)
+        for start in range(0, len(artist_ids), chunk_size):
+            chunk = artist_ids[start:start + chunk_size]
+            rows = Artist.objects.filter(id__in=chunk).values_list('id', 'name', 'profile_picture', 'popularity')
+            found = set()
+            for artist_id, name, profile_picture, popularity in rows:
+                found.add(artist_id)
+                self.upsert(artist_id, name, profile_picture, popularity)
+            for artist_id in set(chunk) - found:
+                self.remove(artist_id)
+
+    def load_snapshot(self) -> bool:
+        """
+        Load the index from the on-disk snapshot. Returns False if there is none
+        """
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+
+        mtime = os.path.getmtime(self.snapshot_path)
+        with open(self.snapshot_path, 'r') as f:
+            snapshot = json.load(f)
+
+        self.load(snapshot['artists'])
+        self._snapshot_mtime = mtime
+        logger.info(f"Loaded autocomplete snapshot with {len(self)} artists from {self.snapshot_path}")
+        return True
+
+    def save_snapshot(self) -> None:
+        """
+        Write the current index contents to the snapshot file atomically
+        """
+        with self._lock:
+            rows = [
+                [artist_id, name, profile_picture, popularity]
+                for artist_id, (name, profile_picture, popularity) in self._artists.items()
+            ]
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'built_at': time.time(), 'artists': rows}, f)
+        os.replace(tmp_path, self.snapshot_path)
+        self._snapshot_mtime = os.path.getmtime(self.snapshot_path)
+
+    def reload_due(self) -> bool:
+        return bool(self.snapshot_path) and time.time() - self._last_reload_check >= self.reload_interval
+
+    def maybe_reload(self) -> None:
+        """
+        Pick up a newer snapshot written by another process, checking at
+        most once every ``reload_interval`` seconds
+        """
+        if not self.reload_due():
+            return
+        self._last_reload_check = time.time()
+
+        try:
+            mtime = os.path.getmtime(self.snapshot_path)
+        except OSError:
+            return
+        if self._snapshot_mtime is None or mtime > self._snapshot_mtime:
+            self.load_snapshot()
+
+
+_prefix_index: Optional[PrefixIndex] = None
+_prefix_index_lock = threading.Lock()
+
+
+def build_prefix_index() -> PrefixIndex:
+    config = settings.ARTIST_AUTOCOMPLETE
+    return PrefixIndex(
+        top_k=config['TOP_K'],
+        precomputed_depth=config['PRECOMPUTED_DEPTH'],
+        snapshot_path=config['SNAPSHOT_PATH'],
+        reload_interval=config['RELOAD_INTERVAL'],
+    )
+
+
+def get_prefix_index() -> PrefixIndex:
+    """
+    Return the process-wide prefix index, loading it from the snapshot
+    (or Postgres when there is no snapshot) on first use
+    """
+    global _prefix_index
+
+    if _prefix_index is None:
+        with _prefix_index_lock:
+            if _prefix_index is None:
+                index = build_prefix_index()
+                if not index.load_snapshot():
+                    start_time = time.time()
+                    index.load_from_database()
+                    logger.info(f"Built autocomplete index for {len(index)} artists in {time.time() - start_time:.2f}s")
+                _prefix_index = index
+    else:
+        _prefix_index.maybe_reload()
+
+    return _prefix_index
+
+
+def prefix_index_loaded() -> bool:
+    return _prefix_index is not None
+
+
+def refresh_prefix_index(artist_ids: Iterable[int]) -> None:
+    """
+    Hook for writes that bypass model signals (bulk_update, queryset.update,
+    raw SQL): bring this process's index up to date for ``artist_ids``.
+    Other processes pick the change up from the snapshot that
+    sync_artist_index writes.
+    """
+    if prefix_backend_enabled() and prefix_index_loaded():
+        get_prefix_index().refresh(artist_ids)
+
+
+def prefix_index_ready() -> bool:
+    """
+    True when get_prefix_index() is a plain in-memory lookup, with no first
+    load or snapshot reload check to do
+    """
+    return _prefix_index is not None and not _prefix_index.reload_due()
+
+
+def prefix_backend_enabled() -> bool:
+    return settings.ARTIST_AUTOCOMPLETE['BACKEND'] == 'prefix'
@@ -0,0 +1,153 @@
+import io
+import logging
+import time
+from django.db import connection, transaction
+from .models import NewArtist
+
+logger = logging.getLogger(__name__)
+
+LOAD_TABLE = 'artists_newartist_load'
+LOAD_COLUMNS = ('musicbrainz_id', 'spotify_id', 'name', 'genre', 'profile_picture', 'location')
+# Above this many rows it is cheaper to rebuild NewArtist's secondary
+# indexes once than to maintain them row by row during the merge
+DROP_INDEXES_THRESHOLD = 100000
+# Characters handed to the driver per COPY write
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+def _copy_value(value):
+    """
+    A value in COPY text format
+    """
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class CopyStream(io.TextIOBase):
+    """
+    Read-only file over COPY text lines, built from ``artists`` only as
+    Postgres asks for more, so nothing beyond one read buffer is held
+    """
+
+    def __init__(self, artists):
+        self._lines = ('\t'.join(_copy_value(getattr(artist, column)) for column in LOAD_COLUMNS) + '\n' for artist in artists)
+        self._buffer = ''
+        self.rows = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+            self.rows += 1
+
+        data = ''.join(chunks)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def copy_load_new_artists(artists, drop_indexes=None):
+    """
+    Load unsaved NewArtist instances from any iterable into NewArtist.
+
+    Rows are streamed with COPY FROM STDIN into a temporary load table and
+    merged in one INSERT ... ON CONFLICT, upserting on musicbrainz_id like
+    upsert_new_artists(). Secondary indexes are dropped for the merge and
+    rebuilt afterwards when ``drop_indexes`` is set, or by default when
+    more than DROP_INDEXES_THRESHOLD rows were loaded. Returns counts and
+    timings.
+    """
+    quote_name = connection.ops.quote_name
+    target_table = NewArtist._meta.db_table
+    columns = ', '.join(quote_name(column) for column in LOAD_COLUMNS)
+    stats = {}
+
+    start_time = time.time()
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Private to this session, unlogged, and gone when the transaction
+        # commits; the TRUNCATE covers a second load inside one outer atomic()
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {LOAD_TABLE} ("
+            "musicbrainz_id uuid, spotify_id varchar(22), name varchar(255), genre varchar(255), "
+            "profile_picture varchar(500), location varchar(255)) ON COMMIT DROP"
+        )
+        cursor.execute(f"TRUNCATE {LOAD_TABLE}")
+
+        stream = CopyStream(artists)
+        _copy_from(cursor, f"COPY {LOAD_TABLE} ({columns}) FROM STDIN", stream)
+        stats['loaded'] = stream.rows
+        stats['copy_seconds'] = time.time() - start_time
+
+        if drop_indexes is None:
+            drop_indexes = stream.rows > DROP_INDEXES_THRESHOLD
+        dropped = _drop_secondary_indexes(cursor, target_table) if drop_indexes else []
+
+        merge_start = time.time()
+        # DISTINCT ON keeps one row per MBID (ON CONFLICT cannot update a row
+        # twice); rows without one are all kept. COPY appends in load order,
+        # so ctid DESC makes the last-loaded duplicate win, as in upsert_new_artists()
+        cursor.execute(
+            f"INSERT INTO {quote_name(target_table)} ({columns}) "
+            f"SELECT DISTINCT ON (COALESCE(musicbrainz_id::text, ctid::text)) {columns} FROM {LOAD_TABLE} "
+            "ORDER BY COALESCE(musicbrainz_id::text, ctid::text), ctid DESC "
+            "ON CONFLICT (musicbrainz_id) DO UPDATE SET name = EXCLUDED.name, location = EXCLUDED.location"
+        )
+        stats['merged'] = cursor.rowcount
+        stats['merge_seconds'] = time.time() - merge_start
+
+        if dropped:
+            rebuild_start = time.time()
+            for index_definition in dropped:
+                cursor.execute(index_definition)
+            stats['index_rebuild_seconds'] = time.time() - rebuild_start
+        stats['indexes_rebuilt'] = len(dropped)
+
+    stats['seconds'] = time.time() - start_time
+    stats['rows_per_second'] = stats['loaded'] / max(stats['seconds'], 0.001)
+    logger.info(
+        f"Loaded {stats['loaded']} rows into {target_table} ({stats['merged']} inserted or updated) "
+        f"in {stats['seconds']:.1f}s ({stats['rows_per_second']:.0f} rows/s)"
+    )
+    return stats
+
+
+def _copy_from(cursor, sql, stream):
+    """
+    Run COPY ... FROM STDIN fed from ``stream`` with psycopg 3, or with
+    psycopg2 when that is the installed driver
+    """
+    if hasattr(cursor, 'copy_expert'):
+        cursor.copy_expert(sql, stream, size=COPY_BUFFER_SIZE)
+        return
+    with cursor.copy(sql) as copy:
+        while data := stream.read(COPY_BUFFER_SIZE):
+            copy.write(data)
+
+
+def _drop_secondary_indexes(cursor, table):
+    """
+    Drop the table's indexes that back no constraint (the primary key and
+    unique indexes stay, ON CONFLICT needs them) and return their
+    definitions for rebuilding
+    """
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)",
+        [table, table],
+    )
+    indexes = cursor.fetchall()
+    for index_name, _ in indexes:
+        cursor.execute(f"DROP INDEX {connection.ops.quote_name(index_name)}")
+    return [index_definition for _, index_definition in indexes]
@@ -0,0 +1,407 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .artist_abbreviations import ARTIST_ABBREVIATIONS
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalization used for the ARTIST_ABBREVIATIONS lookup
+    """
+    return query.lower().replace(' ', '')
+
+
+def result_cache_key(namespace: str, query: str) -> str:
+    """
+    Cache key for a search/autocomplete query. Search abbreviations collapse
+    to their lookup form since only the expansion reaches Elasticsearch;
+    everything else keys on the exact text, which is what the term,
+    phrase-suggester and completion requests see ("Radiohead" and
+    "radiohead" rank and correct differently)
+    """
+    if namespace == 'search':
+        lookup = normalize_query(query)
+        if lookup in ARTIST_ABBREVIATIONS:
+            return f"abbr:{lookup}"
+    return f"q:{query}"
+
+
+class LRUTTLCache:
+    """
+    Bounded, thread-safe in-process LRU cache whose entries expire after ``ttl`` seconds
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SearchResultCache:
+    """
+    Two-tier cache for search and autocomplete payloads.
+
+    Tier one is a per-process LRU with a short TTL, tier two is a shared
+    Django cache backend. Every key embeds a generation number kept in the
+    shared cache; bumping it (see ``invalidate``) retires all entries in
+    every process at once.
+    """
+    GENERATION_KEY = 'artist-results:generation'
+
+    def __init__(self, local_max_entries: int, local_ttl: float, shared_alias: str, shared_ttl: float,
+                 generation_check_interval: float):
+        self.local = LRUTTLCache(local_max_entries, local_ttl)
+        self.shared_alias = shared_alias
+        self.shared_ttl = shared_ttl
+        self.generation_check_interval = generation_check_interval
+
+        self._generation = None
+        self._generation_checked_at = 0.0
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _current_generation(self) -> int:
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_checked_at >= self.generation_check_interval:
+            generation = self.shared.get(self.GENERATION_KEY)
+            if generation is None:
+                self.shared.add(self.GENERATION_KEY, 1, timeout=None)
+                generation = self.shared.get(self.GENERATION_KEY, 1)
+            self._generation = generation
+            self._generation_checked_at = now
+        return self._generation
+
+    async def _acurrent_generation(self) -> int:
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_checked_at >= self.generation_check_interval:
+            generation = await self.shared.aget(self.GENERATION_KEY)
+            if generation is None:
+                await self.shared.aadd(self.GENERATION_KEY, 1, timeout=None)
+                generation = await self.shared.aget(self.GENERATION_KEY, 1)
+            self._generation = generation
+            self._generation_checked_at = now
+        return self._generation
+
+    def _shared_key(self, namespace: str, key: str, generation: int) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return f"artist-results:{generation}:{namespace}:{digest}"
+
+    def get(self, namespace: str, query: str, variant: str = '') -> Any:
+        """
+        Return the cached payload or None, consulting both tiers
+        """
+        key = f"{result_cache_key(namespace, query)}|{variant}"
+        generation = self._current_generation()
+        local_key = (generation, namespace, key)
+
+        payload = self.local.get(local_key, _MISSING)
+        if payload is not _MISSING:
+            return payload
+
+        payload = self.shared.get(self._shared_key(namespace, key, generation))
+        if payload is not None:
+            self.local.set(local_key, payload)
+        return payload
+
+    def set(self, namespace: str, query: str, payload: Any, variant: str = '') -> None:
+        key = f"{result_cache_key(namespace, query)}|{variant}"
+        generation = self._current_generation()
+        self.shared.set(self._shared_key(namespace, key, generation), payload, timeout=self.shared_ttl)
+        self.local.set((generation, namespace, key), payload)
+
+    def get_or_compute(self, namespace: str, query: str, compute: Callable[[], Any],
+                       variant: str = '') -> Tuple[Any, str]:
+        """
+        Return ``(payload, tier)`` where tier is 'local', 'shared' or 'miss'.
+        ``variant`` distinguishes other request parameters, e.g. the page
+        """
+        key = f"{result_cache_key(namespace, query)}|{variant}"
+        generation = self._current_generation()
+        local_key = (generation, namespace, key)
+
+        payload = self.local.get(local_key, _MISSING)
+        if payload is not _MISSING:
+            return payload, 'local'
+
+        shared_key = self._shared_key(namespace, key, generation)
+        payload = self.shared.get(shared_key, _MISSING)
+        if payload is not _MISSING:
+            self.local.set(local_key, payload)
+            return payload, 'shared'
+
+        payload = compute()
+        self.shared.set(shared_key, payload, timeout=self.shared_ttl)
+        self.local.set(local_key, payload)
+        return payload, 'miss'
+
+    async def aget_or_compute(self, namespace: str, query: str, compute: Callable[[], Awaitable[Any]],
+                              variant: str = '') -> Tuple[Any, str]:
+        """
+        Async counterpart of ``get_or_compute`` for the ASGI views
+        """
+        key = f"{result_cache_key(namespace, query)}|{variant}"
+        generation = await self._acurrent_generation()
+        local_key = (generation, namespace, key)
+
+        payload = self.local.get(local_key, _MISSING)
+        if payload is not _MISSING:
+            return payload, 'local'
+
+        shared_key = self._shared_key(namespace, key, generation)
+        payload = await self.shared.aget(shared_key, _MISSING)
+        if payload is not _MISSING:
+            self.local.set(local_key, payload)
+            return payload, 'shared'
+
+        payload = await compute()
+        await self.shared.aset(shared_key, payload, timeout=self.shared_ttl)
+        self.local.set(local_key, payload)
+        return payload, 'miss'
+
+    def invalidate(self) -> None:
+        """
+        Retire every cached result, locally and in the shared tier
+        """
+        try:
+            generation = self.shared.incr(self.GENERATION_KEY)
+        except ValueError:
+            self.shared.add(self.GENERATION_KEY, 1, timeout=None)
+            generation = self.shared.incr(self.GENERATION_KEY)
+        self._generation = generation
+        self._generation_checked_at = time.monotonic()
+        self.local.clear()
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> SearchResultCache:
+    global _result_cache
+
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                config = settings.ARTIST_RESULT_CACHE
+                _result_cache = SearchResultCache(
+                    local_max_entries=config['LOCAL_MAX_ENTRIES'],
+                    local_ttl=config['LOCAL_TTL'],
+                    shared_alias=config['SHARED_ALIAS'],
+                    shared_ttl=config['SHARED_TTL'],
+                    generation_check_interval=config['GENERATION_CHECK_INTERVAL'],
+                )
+    return _result_cache
+
+
+def invalidate_result_cache() -> None:
+    """
+    Invalidation hook for anything that reindexes artists
+    """
+    get_result_cache().invalidate()
+
+
+class ArtistDetailCache:
+    """
+    Read-through cache of serialized artist payloads, keyed by artist id.
+
+    A short-lived per-process LRU sits in front of the shared Django
+    cache. Writes invalidate the shared entry (see ``invalidate``); other
+    processes' local copies age out within ``local_ttl`` seconds.
+
+    Invalidating also marks the artist as recently written for
+    ``primary_read_window`` seconds. A miss inside that window asks
+    ``load`` to read the primary, because a lagging replica could still
+    return the old row and it would then be cached for ``shared_ttl``.
+    """
+
+    def __init__(self, local_max_entries: int, local_ttl: float, shared_alias: str, shared_ttl: float,
+                 primary_read_window: float = 30):
+        self.local = LRUTTLCache(local_max_entries, local_ttl)
+        self.shared_alias = shared_alias
+        self.shared_ttl = shared_ttl
+        self.primary_read_window = primary_read_window
+
+        self.shared_hits = 0
+        self.loads = 0
+        self.primary_loads = 0
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _shared_key(self, artist_id) -> str:
+        return f"artist-detail:{artist_id}"
+
+    def _written_key(self, artist_id) -> str:
+        return f"artist-detail-written:{artist_id}"
+
+    def _loaded(self, artist_id: int, from_primary: bool) -> None:
+        self.loads += 1
+        if from_primary:
+            self.primary_loads += 1
+
+    def get_or_load(self, artist_id: int, load: Callable[[bool], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Return the cached payload for ``artist_id``, calling
+        ``load(from_primary)`` on a miss. Missing artists (``load``
+        returning None) are not cached
+        """
+        payload = self.local.get(artist_id)
+        if payload is not None:
+            return payload
+
+        key, written_key = self._shared_key(artist_id), self._written_key(artist_id)
+        # One round trip for the payload and the recently-written marker
+        cached = self.shared.get_many([key, written_key])
+        payload = cached.get(key)
+        if payload is not None:
+            self.shared_hits += 1
+            self.local.set(artist_id, payload)
+            return payload
+
+        from_primary = written_key in cached
+        payload = load(from_primary)
+        self._loaded(artist_id, from_primary)
+        if payload is not None:
+            self.shared.set(key, payload, timeout=self.shared_ttl)
+            self.local.set(artist_id, payload)
+        return payload
+
+    async def aget_or_load(self, artist_id: int,
+                           load: Callable[[bool], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+        payload = self.local.get(artist_id)
+        if payload is not None:
+            return payload
+
+        key, written_key = self._shared_key(artist_id), self._written_key(artist_id)
+        cached = await self.shared.aget_many([key, written_key])
+        payload = cached.get(key)
+        if payload is not None:
+            self.shared_hits += 1
+            self.local.set(artist_id, payload)
+            return payload
+
+        from_primary = written_key in cached
+        payload = await load(from_primary)
+        self._loaded(artist_id, from_primary)
+        if payload is not None:
+            await self.shared.aset(key, payload, timeout=self.shared_ttl)
+            self.local.set(artist_id, payload)
+        return payload
+
+    def invalidate(self, artist_ids: Iterable[int]) -> None:
+        artist_ids = list(artist_ids)
+        if not artist_ids:
+            return
+        self.shared.delete_many([self._shared_key(artist_id) for artist_id in artist_ids])
+        if self.primary_read_window:
+            self.shared.set_many({self._written_key(artist_id): 1 for artist_id in artist_ids},
+                                 timeout=self.primary_read_window)
+        for artist_id in artist_ids:
+            self.local.delete(artist_id)
+
+    def stats(self) -> Dict[str, Any]:
+        local = self.local.stats()
+        lookups = local['hits'] + local['misses']
+        hits = local['hits'] + self.shared_hits
+        return {
+            'hit_ratio': hits / lookups if lookups else 0.0,
+            'local': local,
+            'shared_hits': self.shared_hits,
+            'loads': self.loads,
+            'primary_loads': self.primary_loads,
+        }
+
+
+_detail_cache = None
+_detail_cache_lock = threading.Lock()
+
+
+def get_detail_cache() -> ArtistDetailCache:
+    global _detail_cache
+
+    if _detail_cache is None:
+        with _detail_cache_lock:
+            if _detail_cache is None:
+                config = settings.ARTIST_DETAIL_CACHE
+                _detail_cache = ArtistDetailCache(
+                    local_max_entries=config['LOCAL_MAX_ENTRIES'],
+                    local_ttl=config['LOCAL_TTL'],
+                    shared_alias=config['SHARED_ALIAS'],
+                    shared_ttl=config['SHARED_TTL'],
+                    primary_read_window=config['PRIMARY_READ_WINDOW'],
+                )
+    return _detail_cache
+
+
+def invalidate_artist_details(artist_ids: Iterable[int]) -> None:
+    """
+    Invalidation hook for writes that bypass model signals (bulk_update, queryset.update)
+    """
+    get_detail_cache().invalidate(artist_ids)
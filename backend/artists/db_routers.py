@@ -0,0 +1,53 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+# Set while serving read-only API traffic; everything else (enrichment
+# scripts, imports, admin) keeps reading from the primary so it always
+# sees its own writes.
+_replica_reads = ContextVar('artist_replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Route ORM reads inside the block to a read replica when one is configured
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaReadMixin:
+    """
+    View mixin serving the whole request under replica_reads()
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ReadReplicaRouter:
+    """
+    Send reads made under replica_reads() to a random DATABASE_REPLICAS
+    alias and every write to the primary ('default')
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects from any alias may be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -1,8 +1,20 @@
+from django.conf import settings
 from django_elasticsearch_dsl import Document, fields
 from django_elasticsearch_dsl.registries import registry
-from elasticsearch_dsl import analyzer, token_filter
+from elasticsearch_dsl import RankFeature, SearchAsYouType, analyzer, token_filter
 from .models import Artist
 
+NAME_PREFIX_MAPPINGS = ('edge_ngram', 'search_as_you_type')
+
+
+class RankFeatureField(fields.DEDField, RankFeature):
+    pass
+
+
+class SearchAsYouTypeField(fields.DEDField, SearchAsYouType):
+    pass
+
+
 # Custom analyzer
 edge_ngram_analyzer = analyzer(
     'edge_ngram_analyzer',
@@ -10,20 +22,44 @@ edge_ngram_analyzer = analyzer(
     filter=['lowercase', token_filter('edge_ngram_filter', type='edge_ngram', min_gram=1, max_gram=20)]
 )
 
-@registry.register_document
-class ArtistDocument(Document):
-    name = fields.TextField(
+
+def artist_name_field(prefix_mapping):
+    """
+    The ``name`` field with the prefix subfield for the given mapping:
+    'edge_ngram' indexes every 1-20 char prefix as a term (name.edge_ngram),
+    'search_as_you_type' indexes shingles plus a single prefix subfield
+    (name.prefix and its _2gram/_3gram/_index_prefix subfields)
+    """
+    if prefix_mapping == 'search_as_you_type':
+        prefix_fields = {'prefix': SearchAsYouTypeField(max_shingle_size=3)}
+    elif prefix_mapping == 'edge_ngram':
+        prefix_fields = {'edge_ngram': fields.TextField(analyzer=edge_ngram_analyzer)}
+    else:
+        raise ValueError(f"Unknown name prefix mapping: {prefix_mapping!r}")
+
+    return fields.TextField(
         analyzer='standard',
         fields={
             'raw': fields.KeywordField(),
-            'edge_ngram': fields.TextField(analyzer=edge_ngram_analyzer),
-            'suggest': fields.CompletionField(),  
+            'suggest': fields.CompletionField(),
+            **prefix_fields,
         }
     )
+
+
+@registry.register_document
+class ArtistDocument(Document):
+    # Indexed so searches can use it as the final search_after tiebreaker
+    id = fields.IntegerField()
+    # Prefix mapping is chosen when the index is built (ARTIST_NAME_PREFIX_MAPPING)
+    name = artist_name_field(settings.ARTIST_NAME_PREFIX_MAPPING)
     genre = fields.TextField()
     profile_picture = fields.TextField()
     location = fields.TextField()
     popularity = fields.IntegerField(attr='get_popularity')  # Remove the default parameter
+    # Popularity as a scoring signal (see popularity_boost() in api/search.py).
+    # rank_feature fields cannot be sorted on, so the integer field above stays.
+    popularity_rank = RankFeatureField()
     
     class Index:
         name = 'artists'
@@ -56,4 +92,8 @@ class ArtistDocument(Document):
         try:
             return instance.get_popularity()
         except (AttributeError, TypeError):
-            return 0
\ No newline at end of file
+            return 0
+
+    def prepare_popularity_rank(self, instance):
+        # rank_feature only accepts strictly positive values
+        return max(self.prepare_popularity(instance) or 0, 0) + 1
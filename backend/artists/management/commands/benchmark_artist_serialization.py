@@ -0,0 +1,50 @@
+import time
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from artists.api.pagination import keyset_queryset
+from artists.api.renderers import ORJSONRenderer, orjson
+from artists.api.serializers import ARTIST_ROW_FIELDS, ArtistSerializer, serialize_artist_rows
+from artists.models import Artist
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request CPU time of ModelSerializer + JSONRenderer against values() rows + orjson for artist list pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-sizes', type=int, nargs='+', default=[12, 100], help='Page sizes to benchmark')
+        parser.add_argument('--iterations', type=int, default=200, help='Requests simulated per page size and path')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; the fast path falls back to the json renderer"))
+
+        for page_size in options['page_sizes']:
+            # Same DB query shape as ArtistListView; both paths include fetching the page
+            def model_path():
+                artists = list(keyset_queryset(Artist.objects.all())[:page_size])
+                return JSONRenderer().render(ArtistSerializer(artists, many=True).data)
+
+            def fast_path():
+                rows = list(keyset_queryset(Artist.objects.values(*ARTIST_ROW_FIELDS))[:page_size])
+                return ORJSONRenderer().render(serialize_artist_rows(rows))
+
+            model_ms = self._cpu_ms_per_call(model_path, iterations)
+            fast_ms = self._cpu_ms_per_call(fast_path, iterations)
+            saved = model_ms - fast_ms
+
+            self.stdout.write(
+                f"page_size={page_size:<4} "
+                f"ModelSerializer+JSONRenderer: {model_ms:.3f} ms CPU/request   "
+                f"values()+orjson: {fast_ms:.3f} ms CPU/request   "
+                f"saved: {saved:.3f} ms ({(saved / model_ms * 100) if model_ms else 0:.0f}%)"
+            )
+
+    def _cpu_ms_per_call(self, func, iterations):
+        # Warm up connection and query caches before measuring
+        for _ in range(min(10, iterations)):
+            func()
+        start = time.process_time()
+        for _ in range(iterations):
+            func()
+        return (time.process_time() - start) * 1000 / iterations
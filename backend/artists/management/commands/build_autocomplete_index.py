@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from artists.autocomplete import build_prefix_index
+
+
+class Command(BaseCommand):
+    help = 'Build the in-process autocomplete index from Postgres and write it to the on-disk snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', type=str, default=None, help='Snapshot path (defaults to ARTIST_AUTOCOMPLETE SNAPSHOT_PATH)')
+
+    def handle(self, *args, **options):
+        index = build_prefix_index()
+        if options['output']:
+            index.snapshot_path = options['output']
+
+        start_time = time.time()
+        index.load_from_database()
+        build_time = time.time() - start_time
+
+        index.save_snapshot()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(index)} artists in {build_time:.2f}s, snapshot written to {index.snapshot_path}"
+        ))
@@ -0,0 +1,182 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from elasticsearch.helpers import streaming_bulk
+from elasticsearch_dsl import Index
+from tqdm import tqdm
+from artists.api.search import prefix_match
+from artists.documents import NAME_PREFIX_MAPPINGS, ArtistDocument, artist_name_field
+from artists.models import Artist
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[position]
+
+
+class Command(BaseCommand):
+    help = 'Build the artist index with each name prefix mapping and compare index size, heap usage and query latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Only load the first N artists (default: whole catalog)')
+        parser.add_argument('--queries', type=int, default=500, help='Number of sample prefixes to time')
+        parser.add_argument('--repeat', type=int, default=3, help='Times each sample prefix is run')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Bulk request size')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for sampling prefixes')
+        parser.add_argument('--keep', action='store_true', help='Keep the comparison indices afterwards')
+
+    def handle(self, *args, **options):
+        self.client = ArtistDocument._get_connection()
+        queryset = Artist.objects.order_by('id')
+        if options['limit']:
+            queryset = queryset[:options['limit']]
+
+        prefixes = self._sample_prefixes(queryset, options['queries'], options['seed'])
+        self.stdout.write(f"Timing {len(prefixes)} sample prefixes x {options['repeat']} runs per mapping")
+
+        reports = {}
+        for prefix_mapping in NAME_PREFIX_MAPPINGS:
+            index_name = f"{ArtistDocument._index._name}_compare_{prefix_mapping}"
+            try:
+                heap_before = self._heap_used()
+                self._build_index(index_name, prefix_mapping, queryset, options['chunk_size'])
+                timings = self._time_queries(index_name, prefix_mapping, prefixes, options['repeat'])
+                reports[prefix_mapping] = {
+                    **self._index_stats(index_name),
+                    # Measured after warming, so it includes what the queries loaded
+                    'heap_delta_bytes': self._heap_used() - heap_before,
+                    **timings,
+                }
+            finally:
+                if not options['keep']:
+                    Index(index_name, using=self.client).delete(ignore_unavailable=True)
+
+        self._print_report(reports)
+
+    def _sample_prefixes(self, queryset, count, seed):
+        names = list(queryset.values_list('name', flat=True)[:50000])
+        if not names:
+            raise CommandError("No artists to compare with")
+
+        rng = random.Random(seed)
+        prefixes = []
+        for _ in range(count):
+            name = rng.choice(names).strip().lower()
+            if name:
+                # Skew towards the 1-3 character prefixes that dominate autocomplete
+                length = rng.choice([1, 2, 2, 3, 3, 4, 5, 8])
+                prefixes.append(name[:length])
+        return prefixes
+
+    def _build_index(self, index_name, prefix_mapping, queryset, chunk_size):
+        mapping = ArtistDocument._doc_type.mapping._clone()
+        mapping.field('name', artist_name_field(prefix_mapping))
+
+        index = Index(index_name, using=self.client)
+        index.delete(ignore_unavailable=True)
+        index.settings(**ArtistDocument._index._settings)
+        index.mapping(mapping)
+        index.create()
+
+        document = ArtistDocument()
+        actions = (
+            {'_index': index_name, '_id': artist.pk, '_source': document.prepare(artist)}
+            for artist in queryset.iterator(chunk_size=chunk_size)
+        )
+
+        start_time = time.time()
+        indexed = 0
+        for ok, _ in tqdm(streaming_bulk(self.client, actions, chunk_size=chunk_size),
+                          desc=f"Indexing {prefix_mapping}"):
+            indexed += ok
+        load_time = time.time() - start_time
+
+        index.refresh()
+        # Merge down so both mappings are measured in the same on-disk state
+        self.client.indices.forcemerge(index=index_name, max_num_segments=1)
+        index.refresh()
+
+        self.stdout.write(f"{prefix_mapping}: indexed {indexed} artists in {load_time:.1f}s")
+
+    def _index_stats(self, index_name):
+        stats = self.client.indices.stats(index=index_name, metric=['store', 'segments', 'docs', 'fielddata', 'completion'])
+        primaries = stats['indices'][index_name]['primaries']
+        return {
+            'docs': primaries['docs']['count'],
+            'store_bytes': primaries['store']['size_in_bytes'],
+            'segments': primaries['segments']['count'],
+            'fielddata_bytes': primaries['fielddata']['memory_size_in_bytes'],
+            'completion_bytes': primaries['completion']['size_in_bytes'],
+        }
+
+    def _heap_used(self, samples=5, interval=0.2):
+        """
+        JVM heap in use across the cluster. Segment memory stats read zero
+        on ES 8, where terms live off-heap, so the comparison uses the heap
+        itself; the median of a few samples damps garbage collection noise.
+        """
+        readings = []
+        for sample in range(samples):
+            if sample:
+                time.sleep(interval)
+            nodes = self.client.nodes.stats(metric='jvm')['nodes'].values()
+            readings.append(sum(node['jvm']['mem']['heap_used_in_bytes'] for node in nodes))
+        return statistics.median(readings)
+
+    def _time_queries(self, index_name, prefix_mapping, prefixes, repeat):
+        # Warm up caches so the first mapping measured is not penalised
+        for prefix in prefixes[:50]:
+            self.client.search(index=index_name, query=prefix_match(prefix, prefix_mapping=prefix_mapping).to_dict(), size=10)
+
+        wall_ms = []
+        took_ms = []
+        for _ in range(repeat):
+            for prefix in prefixes:
+                start_time = time.perf_counter()
+                response = self.client.search(
+                    index=index_name,
+                    query=prefix_match(prefix, prefix_mapping=prefix_mapping).to_dict(),
+                    size=10,
+                    track_total_hits=False,
+                )
+                wall_ms.append((time.perf_counter() - start_time) * 1000)
+                took_ms.append(response['took'])
+
+        return {
+            'p50_ms': statistics.median(wall_ms),
+            'p99_ms': percentile(wall_ms, 99),
+            'took_p50_ms': statistics.median(took_ms),
+            'took_p99_ms': percentile(took_ms, 99),
+        }
+
+    def _print_report(self, reports):
+        header = (
+            f"{'mapping':<20}{'docs':>10}{'size MB':>10}{'segments':>10}{'heap +KB':>10}{'fdata KB':>10}{'compl KB':>10}"
+            f"{'p50 ms':>9}{'p99 ms':>9}{'took p50':>10}{'took p99':>10}"
+        )
+        self.stdout.write("")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for prefix_mapping, report in reports.items():
+            self.stdout.write(
+                f"{prefix_mapping:<20}"
+                f"{report['docs']:>10}"
+                f"{report['store_bytes'] / 1024 / 1024:>10.1f}"
+                f"{report['segments']:>10}"
+                f"{report['heap_delta_bytes'] / 1024:>10.1f}"
+                f"{report['fielddata_bytes'] / 1024:>10.1f}"
+                f"{report['completion_bytes'] / 1024:>10.1f}"
+                f"{report['p50_ms']:>9.2f}"
+                f"{report['p99_ms']:>9.2f}"
+                f"{report['took_p50_ms']:>10.1f}"
+                f"{report['took_p99_ms']:>10.1f}"
+            )
+        self.stdout.write(
+            "heap +KB: JVM heap growth from building and querying the index (approximate, GC dependent); "
+            "fdata KB: fielddata heap; compl KB: completion suggester size"
+        )
+        self.stdout.write(self.style.SUCCESS("Comparison complete"))
@@ -0,0 +1,115 @@
+import concurrent.futures
+import json
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from tqdm import tqdm
+from artists.search_sync import deferred_search_sync
+from artists.spotify_client import SpotifyClient
+from artists.spotify_enrichment import ENRICHABLE_FIELDS, SpotifyArtistEnricher
+
+FIELD_FLAGS = {'genre': 'genre', 'image': 'profile_picture', 'popularity': 'popularity'}
+
+
+class Command(BaseCommand):
+    help = 'Fill artist genre, image and popularity from one Spotify lookup per artist, or refresh them in batches by Spotify ID'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--genre', action='store_true', help='Fill genres')
+        parser.add_argument('--image', action='store_true', help='Fill profile pictures')
+        parser.add_argument('--popularity', action='store_true', help='Fill popularity')
+        parser.add_argument('--overwrite', action='store_true', help='Refresh the selected fields even when already set')
+        parser.add_argument('--refresh', action='store_true', help='Refresh artists with a known Spotify ID, 50 per request, without name searches')
+        parser.add_argument('--workers', type=int, default=4, help='Parallel Spotify lookups')
+        parser.add_argument('--batch-size', type=int, default=200, help='Artists read from the database at a time')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after N artists')
+        parser.add_argument('--checkpoint-file', type=str, default=None, help='File storing the last processed artist ID (default depends on the mode)')
+
+    def handle(self, *args, **options):
+        if not settings.SPOTIFY_CLIENT_ID or not settings.SPOTIFY_CLIENT_SECRET:
+            raise CommandError("Set SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET")
+
+        # No flag means every field
+        fields = [field for flag, field in FIELD_FLAGS.items() if options[flag]] or list(ENRICHABLE_FIELDS)
+        client = SpotifyClient(settings.SPOTIFY_CLIENT_ID, settings.SPOTIFY_CLIENT_SECRET)
+        enricher = SpotifyArtistEnricher(client, fields, overwrite=options['overwrite'])
+
+        checkpoint_file = options['checkpoint_file'] or (
+            'spotify_refresh_checkpoint.json' if options['refresh'] else 'spotify_enrich_checkpoint.json'
+        )
+        last_artist_id = self._load_checkpoint(checkpoint_file)
+        queryset = enricher.refresh_queryset() if options['refresh'] else enricher.queryset()
+        if last_artist_id:
+            self.stdout.write(f"Resuming after artist ID {last_artist_id}")
+            queryset = queryset.filter(id__gt=last_artist_id)
+
+        total = queryset.count()
+        if options['limit']:
+            total = min(total, options['limit'])
+        self.stdout.write(f"Enriching {', '.join(fields)} for {total} artists")
+
+        start_time = time.time()
+        processed = 0
+        with deferred_search_sync(), tqdm(total=total, desc="Enriching artists") as progress, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while processed < total:
+                # Page by ID: enriched artists drop out of the filter, so offsets would skip rows
+                batch = list(queryset.filter(id__gt=last_artist_id)[:min(options['batch_size'], total - processed)])
+                if not batch:
+                    break
+                if options['refresh']:
+                    # One multi-artist request and one bulk_update per chunk
+                    chunk_size = SpotifyClient.MAX_ARTISTS_PER_REQUEST
+                    chunks = [batch[i:i + chunk_size] for i in range(0, len(batch), chunk_size)]
+                    for count in executor.map(self._refresh, [enricher] * len(chunks), chunks):
+                        progress.update(count)
+                else:
+                    for _ in executor.map(self._enrich, [enricher] * len(batch), batch):
+                        progress.update(1)
+
+                processed += len(batch)
+                last_artist_id = batch[-1].id
+                self._save_checkpoint(last_artist_id, enricher.stats, checkpoint_file)
+
+        # A finished run starts from the beginning next time (e.g. the next nightly refresh)
+        if not options['limit'] and os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
+
+        enricher.stats['total'] = processed
+        elapsed = time.time() - start_time
+        self.stdout.write(f"Stats: {enricher.stats}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Enriched {enricher.stats['updated']} of {processed} artists in {elapsed / 60:.2f} minutes"
+        ))
+
+    def _enrich(self, enricher, artist):
+        try:
+            return enricher.enrich_artist(artist)
+        finally:
+            # Worker threads hold their own connections
+            close_old_connections()
+
+    def _refresh(self, enricher, artists):
+        try:
+            return enricher.refresh_artists(artists)
+        finally:
+            close_old_connections()
+
+    def _save_checkpoint(self, artist_id, stats, checkpoint_file):
+        """Save current progress to a checkpoint file"""
+        checkpoint = {
+            'last_artist_id': artist_id,
+            'stats': stats,
+            'timestamp': time.time()
+        }
+        with open(checkpoint_file, 'w') as f:
+            json.dump(checkpoint, f)
+
+    def _load_checkpoint(self, checkpoint_file):
+        """Load the last processed artist ID from a checkpoint file"""
+        if os.path.exists(checkpoint_file):
+            with open(checkpoint_file, 'r') as f:
+                return json.load(f).get('last_artist_id', 0)
+        return 0
@@ -3,9 +3,8 @@ import os
 import time
 import logging
 from django.core.management.base import BaseCommand
-from artists.models import Artist, NewArtist
+from artists.musicbrainz import MUSICBRAINZ_USER_AGENT, new_artist_from_musicbrainz, upsert_new_artists
 import musicbrainzngs
-from django.db import transaction
 from tqdm import tqdm
 
 logging.basicConfig(
@@ -65,11 +64,7 @@ class Command(BaseCommand):
         # Set end offset if provided
         end_offset = options['end_offset'] or offset + limit
         
-        musicbrainzngs.set_useragent(
-            "StarSeeker", 
-            "0.1", 
-            "vssadiquedfd@gmail.com"
-        )
+        musicbrainzngs.set_useragent(*MUSICBRAINZ_USER_AGENT)
 
         progress_bar = tqdm(total=min(limit, end_offset - offset), 
                            desc=f"Process {process_id}: Fetching artists", 
@@ -109,12 +104,8 @@ class Command(BaseCommand):
                     if artist:
                         artists_batch.append(artist)
                 
-                # Bulk create artists in database
-                with transaction.atomic():
-                    created = NewArtist.objects.bulk_create(
-                        artists_batch, 
-                        ignore_conflicts=True
-                    )
+                # Upsert on the MusicBrainz ID so re-fetching a page refreshes rows instead of duplicating them
+                upsert_new_artists(artists_batch)
                 
                 batch_added = len(artists_batch)
                 artists_added += batch_added
@@ -150,34 +141,7 @@ class Command(BaseCommand):
     def _fast_process_artist(self, artist_data):
         """Process artist data from MusicBrainz quickly - skip extra API calls"""
         try:
-            name = artist_data.get('name', '')
-            
-            # Skip artists with no name
-            if not name:
-                return None
-            
-            # Get artist details
-            artist_id = artist_data.get('id')
-            
-            # Use simple placeholder for genre - we'll update this later
-            genre = "Unknown"
-                 
-            # Get location
-            location = artist_data.get('country', 'Unknown')
-            if not location or location == "":
-                location = "Unknown"
-            
-            # Use a predictable placeholder image - we'll update these later
-            profile_picture = f"https://picsum.photos/seed/{artist_id}/400/400"
-            
-            # Create new Artist instance (not saved to DB yet)
-            return NewArtist(
-                name=name[:255],  # Truncate to fit model field
-                genre=genre[:255],
-                location=location[:255],
-                profile_picture=profile_picture
-            )
-        
+            return new_artist_from_musicbrainz(artist_data)
         except Exception as e:
             logger.error(f"Error processing artist {artist_data.get('name', 'Unknown')}: {str(e)}")
-            return None
\ No newline at end of file
+            return None
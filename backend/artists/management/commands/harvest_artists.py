@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+import aiohttp
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from tqdm import tqdm
+from artists.musicbrainz import MUSICBRAINZ_USER_AGENT, new_artist_from_musicbrainz, upsert_new_artists
+
+logger = logging.getLogger(__name__)
+
+MUSICBRAINZ_SEARCH_URL = 'https://musicbrainz.org/ws/2/artist'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value):
+    """
+    Seconds to wait from a Retry-After header, given either as seconds or as
+    an HTTP date. Returns 0 when it is missing or unreadable, so the caller
+    falls back to its own backoff.
+    """
+    if not value:
+        return 0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        logger.warning(f"Ignoring unreadable Retry-After header: {value!r}")
+        return 0
+
+
+class TokenBucket:
+    """
+    Shared request budget: ``rate`` tokens per second, holding at most
+    ``capacity``. Every request from every worker takes one token, so the
+    combined request rate never exceeds ``rate``.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def penalise(self, seconds):
+        """Spend the budget for the next ``seconds`` after the server asks us to back off"""
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class Command(BaseCommand):
+    help = 'Harvest artists from the MusicBrainz search API with async workers sharing one rate limit'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=140000, help='Number of artists to fetch')
+        parser.add_argument('--batch-size', type=int, default=100, help='Artists per API request (MusicBrainz max is 100)')
+        parser.add_argument('--start-offset', type=int, default=0, help='Starting offset for API pagination')
+        parser.add_argument('--concurrency', type=int, default=4, help='Requests kept in flight')
+        parser.add_argument('--rate', type=float, default=1.0, help='Requests per second across all workers')
+        parser.add_argument('--max-retries', type=int, default=6, help='Attempts per page before giving up on it')
+        parser.add_argument('--checkpoint-file', type=str, default='artist_harvest_checkpoint.json', help='File recording completed pages')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] > 100:
+            raise CommandError("MusicBrainz returns at most 100 artists per request")
+        asyncio.run(self._harvest(options))
+
+    async def _harvest(self, options):
+        batch_size = options['batch_size']
+        checkpoint_file = options['checkpoint_file']
+        done_offsets = self._load_checkpoint(checkpoint_file)
+
+        end_offset = options['start_offset'] + options['limit']
+        pages = asyncio.Queue()
+        for offset in range(options['start_offset'], end_offset, batch_size):
+            if offset not in done_offsets:
+                pages.put_nowait((offset, 0))
+        if done_offsets:
+            self.stdout.write(f"Resuming: {len(done_offsets)} pages already harvested")
+
+        # Bounded so fetching can run at most a few batches ahead of the database
+        writes = asyncio.Queue(maxsize=options['concurrency'] * 2)
+        self.bucket = TokenBucket(options['rate'])
+        self.stats = {'pages': 0, 'artists': 0, 'retries': 0, 'failed_pages': 0}
+        self.end_offset = end_offset
+        self.concurrency = options['concurrency']
+        self.outstanding = pages.qsize()
+        if not self.outstanding:
+            for _ in range(self.concurrency):
+                pages.put_nowait(None)
+        self.progress = tqdm(total=self.outstanding * batch_size, desc="Harvesting artists")
+
+        start_time = time.time()
+        headers = {
+            'User-Agent': "{}/{} ( {} )".format(*MUSICBRAINZ_USER_AGENT),
+            'Accept': 'application/json',
+        }
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            writer = asyncio.create_task(self._write_batches(writes, done_offsets, checkpoint_file))
+            workers = [
+                asyncio.create_task(self._fetch_pages(session, pages, writes, options))
+                for _ in range(options['concurrency'])
+            ]
+            await asyncio.gather(*workers)
+            await writes.put(None)
+            await writer
+        self.progress.close()
+
+        elapsed = time.time() - start_time
+        self.stdout.write(
+            f"Fetched {self.stats['pages']} pages ({self.stats['artists']} artists) in {elapsed:.1f}s "
+            f"({self.stats['pages'] / max(elapsed, 0.001):.2f} requests/s), {self.stats['retries']} retries"
+        )
+        if self.stats['failed_pages']:
+            self.stdout.write(self.style.WARNING(
+                f"{self.stats['failed_pages']} pages failed; rerun to retry them from the checkpoint"
+            ))
+        self.stdout.write(self.style.SUCCESS(f"Successfully harvested {self.stats['artists']} artists"))
+
+    async def _fetch_pages(self, session, pages, writes, options):
+        """
+        Worker loop: take the next unclaimed page from the shared queue, so a
+        worker stuck on a slow or failing page never holds up the rest
+        """
+        while True:
+            item = await pages.get()
+            if item is None:
+                return
+            offset, attempt = item
+            if offset >= self.end_offset:
+                self._page_finished(pages)
+                continue
+
+            try:
+                artists = await self._fetch_page(session, offset, options['batch_size'])
+            except (aiohttp.ClientError, asyncio.TimeoutError, RetryableResponse) as e:
+                if attempt + 1 >= options['max_retries']:
+                    logger.error(f"Giving up on offset {offset} after {attempt + 1} attempts: {str(e)}")
+                    self.stats['failed_pages'] += 1
+                    self._page_finished(pages)
+                    continue
+                self.stats['retries'] += 1
+                delay = getattr(e, 'retry_after', 0) or min(60, 2 ** attempt) + random.random()
+                logger.warning(f"Offset {offset} failed ({str(e)}); retrying in {delay:.1f}s")
+                # Requeue later instead of sleeping, so this worker moves on to other pages
+                asyncio.get_running_loop().call_later(delay, pages.put_nowait, (offset, attempt + 1))
+                continue
+
+            self.stats['pages'] += 1
+            if artists is None:
+                # Past the end of the result set: nothing further to fetch
+                self.end_offset = min(self.end_offset, offset)
+            else:
+                await writes.put((offset, artists))
+            self._page_finished(pages)
+
+    def _page_finished(self, pages):
+        self.outstanding -= 1
+        if self.outstanding == 0:
+            for _ in range(self.concurrency):
+                pages.put_nowait(None)
+
+    async def _fetch_page(self, session, offset, batch_size):
+        await self.bucket.acquire()
+        params = {'query': '*', 'limit': batch_size, 'offset': offset, 'fmt': 'json'}
+        async with session.get(MUSICBRAINZ_SEARCH_URL, params=params) as response:
+            if response.status in RETRY_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after:
+                    self.bucket.penalise(retry_after)
+                raise RetryableResponse(response.status, retry_after)
+            response.raise_for_status()
+            data = await response.json()
+
+        if not data.get('artists'):
+            return None
+        return [artist for artist in map(new_artist_from_musicbrainz, data['artists']) if artist]
+
+    async def _write_batches(self, writes, done_offsets, checkpoint_file):
+        """
+        Single writer: upserts each fetched page in a worker thread while the
+        fetchers carry on with the next requests
+        """
+        while True:
+            item = await writes.get()
+            if item is None:
+                return
+            offset, artists = item
+            try:
+                await sync_to_async(upsert_new_artists)(artists)
+            except Exception as e:
+                logger.error(f"Error saving artists from offset {offset}: {str(e)}")
+                self.stats['failed_pages'] += 1
+                continue
+
+            done_offsets.add(offset)
+            self.stats['artists'] += len(artists)
+            self.progress.update(len(artists))
+            self._save_checkpoint(done_offsets, checkpoint_file)
+
+    def _save_checkpoint(self, done_offsets, checkpoint_file):
+        """Save the set of completed page offsets atomically so a crash never leaves a torn file"""
+        checkpoint = {
+            'done_offsets': sorted(done_offsets),
+            'timestamp': time.time()
+        }
+        tmp_file = f"{checkpoint_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_file, checkpoint_file)
+
+    def _load_checkpoint(self, checkpoint_file):
+        """Load the completed page offsets from a checkpoint file"""
+        if os.path.exists(checkpoint_file):
+            with open(checkpoint_file, 'r') as f:
+                return set(json.load(f)['done_offsets'])
+        return set()
+
+
+class RetryableResponse(Exception):
+    def __init__(self, status, retry_after=0):
+        super().__init__(f"HTTP {status}")
+        self.retry_after = retry_after
@@ -0,0 +1,56 @@
+import logging
+import os
+import time
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from tqdm import tqdm
+from artists.bulk_load import copy_load_new_artists
+from artists.musicbrainz import batched, new_artist_from_musicbrainz, read_dump, upsert_new_artists
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Import artists into NewArtist from a local MusicBrainz JSON dump'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Line-delimited JSON dump (plain, .gz, .bz2, .xz or artist.tar.xz)')
+        parser.add_argument('--loader', choices=['copy', 'insert'], default='copy', help='COPY into a staging table and merge, or batched INSERT ... ON CONFLICT')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert (insert loader)')
+        parser.add_argument('--drop-indexes', action='store_true', default=None, help='Rebuild NewArtist indexes after the load (copy loader; default: only for large loads)')
+        parser.add_argument('--limit', type=int, default=None, help='Only import the first N records')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"Dump not found: {path}")
+
+        records = read_dump(path)
+        if options['limit']:
+            records = islice(records, options['limit'])
+        artists = (artist for artist in map(new_artist_from_musicbrainz, records) if artist)
+
+        start_time = time.time()
+        with tqdm(desc="Importing artists", unit=" artists") as progress:
+            if options['loader'] == 'copy':
+                stats = copy_load_new_artists(self._track(artists, progress), drop_indexes=options['drop_indexes'])
+                imported = stats['loaded']
+                self.stdout.write(
+                    f"COPY {stats['copy_seconds']:.1f}s, merge {stats['merge_seconds']:.1f}s, "
+                    f"{stats['indexes_rebuilt']} indexes rebuilt"
+                )
+            else:
+                imported = 0
+                # Only one batch is held in memory at a time, however large the dump
+                for batch in batched(artists, options['batch_size']):
+                    imported += upsert_new_artists(batch)
+                    progress.update(len(batch))
+
+        elapsed = time.time() - start_time
+        self.stdout.write(f"Imported {imported} artists in {elapsed:.1f}s ({imported / max(elapsed, 0.001):.0f} rows/s)")
+        self.stdout.write(self.style.SUCCESS("Dump import complete; run promote_new_artists to publish them"))
+
+    def _track(self, artists, progress):
+        for artist in artists:
+            progress.update(1)
+            yield artist
@@ -0,0 +1,181 @@
+import concurrent.futures
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.utils import timezone
+from elasticsearch.helpers import streaming_bulk
+from elasticsearch_dsl import Index
+from tqdm import tqdm
+from artists.cache import invalidate_result_cache
+from artists.documents import ArtistDocument
+from artists.models import Artist
+
+
+def id_ranges(min_id, max_id, slices):
+    """
+    Split [min_id, max_id] into ``slices`` contiguous, non-overlapping ranges
+    """
+    step = max(1, (max_id - min_id + slices) // slices)
+    return [(start, min(start + step - 1, max_id)) for start in range(min_id, max_id + 1, step)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the artists search index into a new versioned index and atomically switch the alias to it. '
+        'Artists saved while the index is built are re-indexed from their updated_at before and after the swap; '
+        'deletes and queryset.update() writes made during the build are not replayed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Parallel bulk indexing workers')
+        parser.add_argument('--slices', type=int, default=None, help='ID ranges to split the table into (default: 4 per worker)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per server-side cursor round trip and docs per bulk request')
+        parser.add_argument('--replicas', type=int, default=None, help='Replicas to restore after the load (default: index settings)')
+        parser.add_argument('--keep-old', action='store_true', help='Keep the previous index instead of deleting it after the swap')
+        parser.add_argument('--no-swap', action='store_true', help='Build and optimise the new index but leave the alias alone')
+        parser.add_argument('--merge-timeout', type=int, default=3600, help='Seconds to wait for the force merge to finish')
+
+    def handle(self, *args, **options):
+        self.client = ArtistDocument._get_connection()
+        alias = ArtistDocument._index._name
+        new_index = f"{alias}_{time.strftime('%Y%m%d%H%M%S')}"
+
+        bounds = Artist.objects.aggregate(min_id=Min('id'), max_id=Max('id'))
+        if bounds['min_id'] is None:
+            raise CommandError("No artists to index")
+
+        index_settings = ArtistDocument._index._settings
+        replicas = options['replicas'] if options['replicas'] is not None else index_settings.get('number_of_replicas', 1)
+        refresh_interval = index_settings.get('refresh_interval', '1s')
+
+        self.stdout.write(f"Building {new_index}")
+        index = self._create_index(new_index)
+
+        # Saves made from here on reach the old index only; they are replayed below
+        build_started = timezone.now()
+        try:
+            indexed = self._load(new_index, bounds, options)
+            load_time = (timezone.now() - build_started).total_seconds()
+            self.stdout.write(f"Indexed {indexed} artists in {load_time:.1f}s ({indexed / max(load_time, 0.001):.0f} docs/s)")
+
+            self.client.indices.put_settings(index=new_index, settings={
+                'index': {'refresh_interval': refresh_interval, 'number_of_replicas': replicas},
+            })
+            index.refresh()
+            self.stdout.write("Force-merging")
+            # A single-segment merge of a large index takes far longer than
+            # the client's default request timeout
+            self.client.options(request_timeout=options['merge_timeout']).indices.forcemerge(
+                index=new_index, max_num_segments=1,
+            )
+
+            replay_started = timezone.now()
+            replayed = self._replay_changes(new_index, build_started, options['chunk_size'])
+            if replayed:
+                self.stdout.write(f"Re-indexed {replayed} artists saved during the build")
+        except BaseException:
+            # Nothing points at the new index yet; don't leave it behind
+            index.delete(ignore_unavailable=True)
+            raise
+
+        if options['no_swap']:
+            self.stdout.write(self.style.SUCCESS(f"Built {new_index}; alias {alias} left unchanged"))
+            return
+
+        old_indices = self._swap_alias(alias, new_index)
+        # Catch saves that landed on the old index between the replay and the swap
+        self._replay_changes(new_index, replay_started, options['chunk_size'])
+        # Cached results were served from the old index
+        invalidate_result_cache()
+        if old_indices and not options['keep_old']:
+            for old_index in old_indices:
+                self.client.indices.delete(index=old_index, ignore_unavailable=True)
+            self.stdout.write(f"Deleted {', '.join(old_indices)}")
+
+        self.stdout.write(self.style.SUCCESS(f"{alias} now points to {new_index}"))
+
+    def _create_index(self, index_name):
+        index = Index(index_name, using=self.client)
+        index.settings(**{
+            **ArtistDocument._index._settings,
+            # Nothing searches the new index until the alias moves, so skip
+            # refreshes and replica copies while it is being filled
+            'refresh_interval': '-1',
+            'number_of_replicas': 0,
+        })
+        index.mapping(ArtistDocument._doc_type.mapping)
+        index.create()
+        return index
+
+    def _load(self, index_name, bounds, options):
+        slices = options['slices'] or options['workers'] * 4
+        ranges = id_ranges(bounds['min_id'], bounds['max_id'], slices)
+        total = Artist.objects.count()
+
+        indexed = 0
+        with tqdm(total=total, desc="Indexing artists") as progress:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                futures = [
+                    executor.submit(self._index_range, index_name, start_id, end_id, options['chunk_size'], progress)
+                    for start_id, end_id in ranges
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    indexed += future.result()
+        return indexed
+
+    def _index_range(self, index_name, start_id, end_id, chunk_size, progress):
+        document = ArtistDocument()
+        # iterator() streams through a server-side cursor on Postgres, so a
+        # worker holds at most chunk_size rows at a time
+        artists = Artist.objects.filter(id__gte=start_id, id__lte=end_id).order_by('id').iterator(chunk_size=chunk_size)
+        actions = (
+            {'_index': index_name, '_id': artist.pk, '_source': document.prepare(artist)}
+            for artist in artists
+        )
+
+        indexed = 0
+        try:
+            for ok, _ in streaming_bulk(self.client, actions, chunk_size=chunk_size, max_retries=3):
+                indexed += ok
+                progress.update(1)
+        finally:
+            # Each worker thread opened its own connection
+            connection.close()
+        return indexed
+
+    def _replay_changes(self, index_name, since, chunk_size):
+        """
+        Re-index artists saved since ``since`` into ``index_name`` and return
+        how many were sent
+        """
+        document = ArtistDocument()
+        artists = Artist.objects.filter(updated_at__gte=since).order_by('id').iterator(chunk_size=chunk_size)
+        actions = (
+            {'_index': index_name, '_id': artist.pk, '_source': document.prepare(artist)}
+            for artist in artists
+        )
+        replayed = 0
+        for ok, _ in streaming_bulk(self.client, actions, chunk_size=chunk_size, max_retries=3, refresh=True):
+            replayed += ok
+        return replayed
+
+    def _swap_alias(self, alias, new_index):
+        """
+        Point ``alias`` at ``new_index`` in one update_aliases call and return
+        the indices it pointed at before
+        """
+        actions = [{'add': {'index': new_index, 'alias': alias}}]
+        old_indices = []
+
+        if self.client.indices.exists_alias(name=alias):
+            old_indices = list(self.client.indices.get_alias(name=alias).keys())
+            actions = [{'remove': {'index': old_index, 'alias': alias}} for old_index in old_indices] + actions
+        elif self.client.indices.exists(index=alias):
+            # First run: a concrete index still holds the alias name; it is
+            # removed in the same atomic call that creates the alias
+            actions = [{'remove_index': {'index': alias}}] + actions
+            self.stdout.write(f"Replacing concrete index {alias} with an alias")
+
+        self.client.indices.update_aliases(actions=actions)
+        return old_indices
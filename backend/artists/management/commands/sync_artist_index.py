@@ -0,0 +1,142 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+from elasticsearch.helpers import streaming_bulk
+from artists.autocomplete import get_prefix_index, prefix_backend_enabled
+from artists.cache import invalidate_result_cache
+from artists.documents import ArtistDocument
+from artists.models import Artist
+
+
+class Command(BaseCommand):
+    help = 'Reindex artists changed since the last run (by updated_at) and remove documents of deleted artists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watermark-file', type=str, default='artist_index_watermark.json', help='File storing the last synced updated_at')
+        parser.add_argument('--full', action='store_true', help='Ignore the stored watermark and reindex every artist')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per cursor fetch and docs per bulk request')
+        parser.add_argument('--overlap', type=int, default=60, help='Seconds re-read before the watermark to catch late-committing transactions')
+        parser.add_argument('--interval', type=int, default=None, help='Keep running, syncing every N seconds')
+        parser.add_argument('--prune-every', type=int, default=10, help='Check for deleted artists every N passes (0 disables)')
+
+    def handle(self, *args, **options):
+        self.client = ArtistDocument._get_connection()
+        self.index_name = ArtistDocument._index._name
+        watermark = None if options['full'] else self._load_watermark(options['watermark_file'])
+
+        passes = 0
+        while True:
+            prune = options['prune_every'] > 0 and passes % options['prune_every'] == 0
+            watermark = self._sync_pass(watermark, prune, options)
+            self._save_watermark(watermark, options['watermark_file'])
+            passes += 1
+
+            if options['interval'] is None:
+                break
+            # Long-running loop: don't hold on to a connection the server may have dropped
+            close_old_connections()
+            time.sleep(options['interval'])
+
+    def _sync_pass(self, watermark, prune, options):
+        start_time = time.time()
+        # Taken before reading, so rows committed during this pass are picked up next time
+        pass_started_at = timezone.now()
+
+        queryset = Artist.objects.order_by('updated_at', 'id')
+        if watermark is not None:
+            queryset = queryset.filter(updated_at__gte=watermark - timedelta(seconds=options['overlap']))
+
+        document = ArtistDocument()
+        changed_ids = []
+
+        def actions():
+            for artist in queryset.iterator(chunk_size=options['chunk_size']):
+                changed_ids.append(artist.pk)
+                yield {'_index': self.index_name, '_id': artist.pk, '_source': document.prepare(artist)}
+
+        indexed = 0
+        for ok, _ in streaming_bulk(self.client, actions(), chunk_size=options['chunk_size'], max_retries=3):
+            indexed += ok
+
+        deleted_ids = self._prune_deleted(options['chunk_size']) if prune else set()
+        deleted = len(deleted_ids)
+
+        if prefix_backend_enabled() and (changed_ids or deleted_ids):
+            self._update_prefix_index(changed_ids, deleted_ids, full=watermark is None)
+
+        if indexed or deleted:
+            # Writes that reach the index only through this command (bulk_update,
+            # the promote SQL) would otherwise keep serving cached results.
+            # Refresh first so the next search re-caches the new documents
+            self.client.indices.refresh(index=self.index_name)
+            invalidate_result_cache()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Reindexed {indexed} changed artists, removed {deleted} deleted artists in {time.time() - start_time:.1f}s"
+        ))
+        return pass_started_at
+
+    def _update_prefix_index(self, changed_ids, deleted_ids, full):
+        """
+        Apply the pass to the autocomplete prefix index and rewrite its
+        snapshot, which the web processes reload within RELOAD_INTERVAL.
+        This covers writes that bypass model signals (bulk_update, the
+        promote SQL) as well as ones made in other processes.
+        """
+        index = get_prefix_index()
+        if full:
+            # Cheaper than upserting every artist one by one
+            index.load_from_database()
+        else:
+            index.refresh([*changed_ids, *deleted_ids])
+        if index.snapshot_path:
+            index.save_snapshot()
+
+    def _prune_deleted(self, chunk_size):
+        """
+        Walk every document id in the index (in id order with search_after),
+        delete the ones whose artist row no longer exists and return their ids
+        """
+        deleted = set()
+        search_after = None
+        while True:
+            response = self.client.search(
+                index=self.index_name,
+                source=False,
+                sort=[{'id': 'asc'}],
+                size=chunk_size,
+                search_after=search_after,
+                track_total_hits=False,
+            )
+            hits = response['hits']['hits']
+            if not hits:
+                return deleted
+
+            indexed_ids = {int(hit['_id']) for hit in hits}
+            existing_ids = set(Artist.objects.filter(id__in=indexed_ids).values_list('id', flat=True))
+            missing_ids = indexed_ids - existing_ids
+            if missing_ids:
+                actions = ({'_op_type': 'delete', '_index': self.index_name, '_id': artist_id} for artist_id in missing_ids)
+                for ok, item in streaming_bulk(self.client, actions, raise_on_error=False):
+                    if ok:
+                        deleted.add(int(item['delete']['_id']))
+
+            search_after = hits[-1]['sort']
+
+    def _save_watermark(self, watermark, watermark_file):
+        """Persist the watermark atomically so a crash never leaves a torn file"""
+        tmp_file = f"{watermark_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'updated_at': watermark.isoformat(), 'timestamp': time.time()}, f)
+        os.replace(tmp_file, watermark_file)
+
+    def _load_watermark(self, watermark_file):
+        """Load the last synced updated_at, or None to sync everything"""
+        if os.path.exists(watermark_file):
+            with open(watermark_file, 'r') as f:
+                return datetime.fromisoformat(json.load(f)['updated_at'])
+        return None
@@ -4,9 +4,11 @@ import time
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from django.core.management.base import BaseCommand
+from artists.cache import invalidate_artist_details, invalidate_result_cache
 from artists.models import Artist
 import musicbrainzngs
 from django.db import transaction
+from django.utils import timezone
 from tqdm import tqdm
 
 logging.basicConfig(
@@ -147,12 +149,18 @@ class Command(BaseCommand):
                         artists_to_update = list(Artist.objects.filter(id__in=update_dict.keys()))
                         
                         # Update each artist's genre
+                        updated_at = timezone.now()
                         for artist in artists_to_update:
                             artist.genre = update_dict[artist.id]
+                            artist.updated_at = updated_at
                         
                         # Bulk update
                         if artists_to_update:
-                            Artist.objects.bulk_update(artists_to_update, ['genre'])
+                            Artist.objects.bulk_update(artists_to_update, ['genre', 'updated_at'])
+                    
+                    # bulk_update skips model signals, so drop cached results explicitly
+                    invalidate_result_cache()
+                    invalidate_artist_details(update_dict.keys())
                     
                     # Update checkpoint
                     last_artist_id = artists_chunk[-1].id
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 12:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0005_artist_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artist',
+            index=models.Index(django.db.models.functions.text.Lower(django.db.models.functions.text.Trim('name')), django.db.models.functions.text.Lower(django.db.models.functions.text.Trim('location')), name='artists_art_norm_name_loc_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0006_artist_norm_name_location_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artist',
+            name='musicbrainz_id',
+            field=models.UUIDField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='artist',
+            name='spotify_id',
+            field=models.CharField(blank=True, max_length=22, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='newartist',
+            name='musicbrainz_id',
+            field=models.UUIDField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='newartist',
+            name='spotify_id',
+            field=models.CharField(blank=True, max_length=22, null=True, unique=True),
+        ),
+    ]
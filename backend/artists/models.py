@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower, Trim
 
 class Artist(models.Model):
     name = models.CharField(max_length=255, db_index=True)
@@ -6,6 +7,12 @@ class Artist(models.Model):
     profile_picture = models.URLField(max_length=500, blank=True, null=True)
     location = models.CharField(max_length=255)
     popularity = models.IntegerField(default=0) 
+    # Bumped on every save(); writes that bypass save() (bulk_update,
+    # queryset.update) must set it themselves so incremental reindexing sees them
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # External IDs; unique, so imports and enrichment can upsert on them
+    musicbrainz_id = models.UUIDField(unique=True, null=True, blank=True)
+    spotify_id = models.CharField(max_length=22, unique=True, null=True, blank=True)
 
 
     class Meta:
@@ -13,6 +20,10 @@ class Artist(models.Model):
             models.Index(fields=['name']),
             models.Index(fields=['genre']),
             models.Index(fields=['location']),
+            # Keyset pagination on (popularity DESC, id DESC), read by a backward scan
+            models.Index(fields=['popularity', 'id'], name='artists_art_popular_id_idx'),
+            # Dedupe key used when promoting NewArtist rows (promote_new_artists)
+            models.Index(Lower(Trim('name')), Lower(Trim('location')), name='artists_art_norm_name_loc_idx'),
         ]
 
     def __str__(self):
@@ -27,6 +38,8 @@ class NewArtist(models.Model):
     genre = models.CharField(max_length=255)
     profile_picture = models.URLField(max_length=500, blank=True, null=True)
     location = models.CharField(max_length=255)
+    musicbrainz_id = models.UUIDField(unique=True, null=True, blank=True)
+    spotify_id = models.CharField(max_length=22, unique=True, null=True, blank=True)
 
     class Meta:
         indexes = [
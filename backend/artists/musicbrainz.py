@@ -0,0 +1,103 @@
+import bz2
+import gzip
+import json
+import logging
+import lzma
+import tarfile
+from itertools import islice
+from django.db import transaction
+from .models import NewArtist
+
+logger = logging.getLogger(__name__)
+
+MUSICBRAINZ_USER_AGENT = ("StarSeeker", "0.1", "vssadiquedfd@gmail.com")
+
+# Compressed single-file dumps, by extension
+DUMP_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+# Member holding the artist records inside the official artist.tar.xz dump
+DUMP_ARCHIVE_MEMBER = 'mbdump/artist'
+
+
+def new_artist_from_musicbrainz(artist_data):
+    """
+    Unsaved NewArtist for a MusicBrainz artist record (search result or dump
+    line), or None if the record has no name
+    """
+    name = artist_data.get('name', '')
+
+    # Skip artists with no name
+    if not name:
+        return None
+
+    artist_id = artist_data.get('id')
+
+    # Use simple placeholder for genre - we'll update this later
+    genre = "Unknown"
+
+    location = artist_data.get('country', 'Unknown')
+    if not location or location == "":
+        location = "Unknown"
+
+    # Use a predictable placeholder image - we'll update these later
+    profile_picture = f"https://picsum.photos/seed/{artist_id}/400/400"
+
+    return NewArtist(
+        musicbrainz_id=artist_id,
+        name=name[:255],  # Truncate to fit model field
+        genre=genre[:255],
+        location=location[:255],
+        profile_picture=profile_picture
+    )
+
+
+def upsert_new_artists(artists):
+    """
+    Insert staging rows, refreshing the ones whose MusicBrainz ID is already staged
+    """
+    # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+    unique_artists = list({artist.musicbrainz_id or id(artist): artist for artist in artists}.values())
+    with transaction.atomic():
+        NewArtist.objects.bulk_create(
+            unique_artists,
+            update_conflicts=True,
+            unique_fields=['musicbrainz_id'],
+            update_fields=['name', 'location'],
+        )
+    return len(unique_artists)
+
+
+def _dump_lines(path):
+    if tarfile.is_tarfile(path):
+        # Stream mode reads the archive front to back without an index
+        with tarfile.open(path, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and member.name.endswith(DUMP_ARCHIVE_MEMBER):
+                    for line in archive.extractfile(member):
+                        yield line.decode('utf-8')
+                    return
+        raise ValueError(f"{path} has no {DUMP_ARCHIVE_MEMBER} member")
+
+    opener = next((opener for suffix, opener in DUMP_OPENERS.items() if path.endswith(suffix)), open)
+    with opener(path, 'rt', encoding='utf-8') as f:
+        yield from f
+
+
+def read_dump(path):
+    """
+    Yield MusicBrainz artist records one at a time from a line-delimited JSON
+    dump: plain, .gz/.bz2/.xz, or the artist.tar.xz archive
+    """
+    for line_number, line in enumerate(_dump_lines(path), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            logger.warning(f"Skipping malformed dump line {line_number}")
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
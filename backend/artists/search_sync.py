@@ -0,0 +1,240 @@
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connection, transaction
+from django_elasticsearch_dsl.signals import RealTimeSignalProcessor
+from elasticsearch.helpers import bulk
+from .cache import invalidate_result_cache
+
+logger = logging.getLogger(__name__)
+
+INDEX = 'index'
+DELETE = 'delete'
+
+
+def search_sync_settings():
+    return getattr(settings, 'ARTIST_SEARCH_SYNC', {})
+
+
+# Set by deferred_search_sync() for batch jobs running inside a realtime process
+_force_deferred = False
+
+
+def deferred_sync_enabled():
+    return _force_deferred or search_sync_settings().get('MODE', 'realtime') == 'deferred'
+
+
+@contextmanager
+def deferred_search_sync():
+    """
+    Buffer Artist index updates inside the block and flush them when it exits
+    """
+    global _force_deferred
+    previous, _force_deferred = _force_deferred, True
+    try:
+        yield
+    finally:
+        _force_deferred = previous
+        flush_search_sync()
+
+
+class ArtistSyncQueue:
+    """
+    Buffer of artist IDs whose search documents are out of date.
+
+    Repeated saves of the same artist collapse into one pending operation
+    (the last one wins). The buffer is written to Elasticsearch with one bulk
+    request once it holds ``batch_size`` artists or its oldest entry is
+    ``flush_interval`` seconds old, whichever comes first.
+    """
+
+    def __init__(self, batch_size=500, flush_interval=5.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self.stats = {'queued': 0, 'coalesced': 0, 'indexed': 0, 'deleted': 0, 'errors': 0, 'flushes': 0}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def enqueue(self, artist_id, operation=INDEX):
+        with self._lock:
+            if artist_id in self._pending:
+                self.stats['coalesced'] += 1
+            else:
+                self.stats['queued'] += 1
+            self._pending[artist_id] = operation
+            full = len(self._pending) >= self.batch_size
+            if not full:
+                self._arm_timer()
+
+        if full:
+            self.flush()
+
+    def _arm_timer(self):
+        # Callers hold self._lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """
+        Write every pending artist to the index, returning how many
+        operations were sent
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not pending:
+                return 0
+
+            start_time = time.time()
+            try:
+                actions = self._build_actions(pending)
+                sent, errors = bulk(
+                    self._client(), actions,
+                    chunk_size=self.batch_size, raise_on_error=False, refresh=False,
+                )
+            except Exception:
+                # Connection errors and timeouts raise despite raise_on_error=False;
+                # put the batch back (entries queued since then are newer and win)
+                # and try again on the next tick
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                    self._arm_timer()
+                raise
+            # Deleting an artist that was never indexed is not an error
+            errors = [error for error in errors if error.get(DELETE, {}).get('status') != 404]
+
+            self.stats['flushes'] += 1
+            self.stats['errors'] += len(errors)
+            for error in errors[:10]:
+                logger.error(f"Search sync failed: {error}")
+            logger.info(f"Synced {len(actions)} artists to the search index in {time.time() - start_time:.2f}s")
+            # Cached search results may predate these documents; in deferred
+            # mode the per-save invalidation is skipped in favour of this one
+            invalidate_result_cache()
+            return len(actions)
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Search sync flush failed: {str(e)}")
+        finally:
+            # Each timer thread opens its own connection, and a healthy one
+            # younger than CONN_MAX_AGE would survive close_old_connections()
+            connection.close()
+
+    def _build_actions(self, pending):
+        from .documents import ArtistDocument
+        from .models import Artist
+
+        index_name = ArtistDocument._index._name
+        document = ArtistDocument()
+        index_ids = [artist_id for artist_id, operation in pending.items() if operation == INDEX]
+
+        actions = []
+        found = set()
+        # Documents are built from the current rows, so an artist saved several
+        # times since the last flush is read (and indexed) once
+        for artist in Artist.objects.filter(id__in=index_ids).iterator(chunk_size=self.batch_size):
+            found.add(artist.id)
+            actions.append({'_op_type': INDEX, '_index': index_name, '_id': artist.id, '_source': document.prepare(artist)})
+        self.stats['indexed'] += len(found)
+
+        # Deleted since it was queued, or deleted outright
+        for artist_id, operation in pending.items():
+            if operation == DELETE or artist_id not in found:
+                actions.append({'_op_type': DELETE, '_index': index_name, '_id': artist_id})
+                self.stats['deleted'] += 1
+        return actions
+
+    def _client(self):
+        from .documents import ArtistDocument
+        return ArtistDocument._get_connection()
+
+
+_sync_queue = None
+_sync_queue_lock = threading.Lock()
+
+
+def get_sync_queue():
+    global _sync_queue
+    if _sync_queue is None:
+        with _sync_queue_lock:
+            if _sync_queue is None:
+                config = search_sync_settings()
+                _sync_queue = ArtistSyncQueue(
+                    batch_size=config.get('BATCH_SIZE', 500),
+                    flush_interval=config.get('FLUSH_INTERVAL', 5.0),
+                )
+                atexit.register(flush_search_sync)
+    return _sync_queue
+
+
+def _enqueue_on_commit(artist_ids, operation):
+    # A flush reads rows on its own connection: queued before the write
+    # commits, an updated row would be indexed stale and an inserted one
+    # not found and turned into a DELETE. Runs at once outside a transaction
+    artist_ids = list(artist_ids)
+
+    def enqueue():
+        queue = get_sync_queue()
+        for artist_id in artist_ids:
+            queue.enqueue(artist_id, operation)
+
+    transaction.on_commit(enqueue)
+
+
+def mark_artists_dirty(artist_ids):
+    """
+    Queue index updates for artists written without model signals
+    (bulk_update, queryset.update) once the current transaction commits
+    """
+    _enqueue_on_commit(artist_ids, INDEX)
+
+
+def flush_search_sync():
+    """
+    Write any buffered artist updates to the index now
+    """
+    if _sync_queue is None:
+        return 0
+    return _sync_queue.flush()
+
+
+class ArtistSyncSignalProcessor(RealTimeSignalProcessor):
+    """
+    django_elasticsearch_dsl signal processor for ARTIST_SEARCH_SYNC.
+
+    In 'realtime' mode every save is indexed synchronously, as before. In
+    'deferred' mode Artist saves and deletes only mark the artist dirty in
+    the ArtistSyncQueue; other models keep the realtime behaviour.
+    """
+
+    def _deferred(self, sender):
+        from .models import Artist
+        return sender is Artist and deferred_sync_enabled()
+
+    def handle_save(self, sender, instance, **kwargs):
+        if self._deferred(sender):
+            _enqueue_on_commit([instance.pk], INDEX)
+        else:
+            super().handle_save(sender, instance, **kwargs)
+
+    def handle_delete(self, sender, instance, **kwargs):
+        if self._deferred(sender):
+            _enqueue_on_commit([instance.pk], DELETE)
+        else:
+            super().handle_delete(sender, instance, **kwargs)
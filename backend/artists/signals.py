@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import get_prefix_index, prefix_backend_enabled, prefix_index_loaded
+from .cache import invalidate_artist_details, invalidate_result_cache
+from .models import Artist
+from .search_sync import deferred_sync_enabled
+
+
+@receiver(post_save, sender=Artist)
+def update_prefix_index(sender, instance, **kwargs):
+    # Only keep an already-loaded index fresh; saves from scripts should not trigger a full build
+    if prefix_backend_enabled() and prefix_index_loaded():
+        get_prefix_index().upsert(instance.id, instance.name, instance.profile_picture, instance.popularity)
+
+
+@receiver(post_delete, sender=Artist)
+def remove_from_prefix_index(sender, instance, **kwargs):
+    if prefix_backend_enabled() and prefix_index_loaded():
+        get_prefix_index().remove(instance.id)
+
+
+@receiver(post_save, sender=Artist)
+@receiver(post_delete, sender=Artist)
+def invalidate_cached_results(sender, instance, **kwargs):
+    # Saves and deletes reindex the artist document, so cached search results may be stale.
+    # Deferred sync reindexes later and invalidates once per flush instead.
+    if not deferred_sync_enabled():
+        invalidate_result_cache()
+
+
+@receiver(post_save, sender=Artist)
+@receiver(post_delete, sender=Artist)
+def invalidate_cached_detail(sender, instance, **kwargs):
+    invalidate_artist_details([instance.pk])
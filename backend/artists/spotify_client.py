@@ -12,12 +12,17 @@ class SpotifyClient:
     """
     BASE_URL = "https://api.spotify.com/v1"
     AUTH_URL = "https://accounts.spotify.com/api/token"
+    MAX_RATE_LIMIT_RETRIES = 5
+    # Most IDs the multi-artist endpoint accepts per request
+    MAX_ARTISTS_PER_REQUEST = 50
     
     def __init__(self, client_id: str, client_secret: str):
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token = None
         self.token_expiry = 0
+        # Reuse connections across requests
+        self.session = requests.Session()
     
     def _get_auth_header(self) -> Dict[str, str]:
         """
@@ -47,7 +52,7 @@ class SpotifyClient:
         data = {"grant_type": "client_credentials"}
         
         try:
-            response = requests.post(self.AUTH_URL, headers=headers, data=data)
+            response = self.session.post(self.AUTH_URL, headers=headers, data=data)
             response.raise_for_status()
             
             response_data = response.json()
@@ -60,9 +65,9 @@ class SpotifyClient:
             logger.error(f"Failed to obtain Spotify access token: {str(e)}")
             raise
     
-    def _make_api_request(self, method: str, endpoint: str, params: Optional[Dict] = None) -> Dict:
+    def _make_api_request(self, method: str, endpoint: str, params: Optional[Dict] = None, attempt: int = 0) -> Dict:
         """
-        Make an authenticated request to the Spotify API
+        Make an authenticated request to the Spotify API, waiting out rate limits
         """
         self._ensure_token()
         
@@ -71,7 +76,7 @@ class SpotifyClient:
         
         try:
             if method.lower() == "get":
-                response = requests.get(url, headers=headers, params=params)
+                response = self.session.get(url, headers=headers, params=params)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
@@ -96,6 +101,9 @@ class SpotifyClient:
             if status_code == 429: 
                 retry_after = int(e.response.headers.get("Retry-After", 3))
                 logger.warning(f"Rate limited by Spotify. Retry after {retry_after} seconds")
+                if attempt < self.MAX_RATE_LIMIT_RETRIES:
+                    time.sleep(retry_after)
+                    return self._make_api_request(method, endpoint, params, attempt + 1)
             
             raise
         except requests.exceptions.RequestException as e:
@@ -121,6 +129,18 @@ class SpotifyClient:
         endpoint = f"artists/{artist_id}"
         return self._make_api_request("get", endpoint)
     
+    def get_artists(self, artist_ids: List[str]) -> List[Optional[Dict]]:
+        """
+        Get up to MAX_ARTISTS_PER_REQUEST artists by Spotify ID in one request
+
+        Results are in the order of ``artist_ids``; unknown IDs come back as None
+        """
+        if len(artist_ids) > self.MAX_ARTISTS_PER_REQUEST:
+            raise ValueError(f"At most {self.MAX_ARTISTS_PER_REQUEST} artist IDs per request, got {len(artist_ids)}")
+        endpoint = "artists"
+        params = {"ids": ",".join(artist_ids)}
+        return self._make_api_request("get", endpoint, params).get("artists", [])
+    
     def get_best_artist_match(self, name: str) -> Optional[Dict]:
         """
         Search for an artist and return the best match based on name
@@ -0,0 +1,234 @@
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+from django.db.models import Q
+from django.utils import timezone
+from .autocomplete import refresh_prefix_index
+from .cache import invalidate_artist_details, invalidate_result_cache
+from .models import Artist
+from .search_sync import mark_artists_dirty
+from .spotify_client import SpotifyClient
+
+logger = logging.getLogger(__name__)
+
+# Artist columns filled from Spotify artist data
+ENRICHABLE_FIELDS = ('genre', 'profile_picture', 'popularity')
+PLACEHOLDER_PICTURE_PREFIX = 'https://picsum.photos/'
+
+
+def get_primary_genre(genres: List[str]) -> str:
+    """
+    Get the primary genre from a list of Spotify genres, or 'Unknown' if there are none
+    """
+    if not genres:
+        return "Unknown"
+
+    # Simply return the first genre as the primary genre
+    return genres[0].title()  # Capitalize the genre name
+
+
+def get_best_image(images: List[Dict]) -> Optional[str]:
+    """
+    Get the best image URL from a list of Spotify image objects (medium size
+    preferred), or None if there are none
+    """
+    if not images:
+        return None
+
+    # Spotify usually provides images in 3 sizes, we prefer the middle one
+    if len(images) >= 3:
+        sorted_images = sorted(images, key=lambda x: x.get('width', 0))
+        return sorted_images[len(images) // 2]['url']
+
+    # If there are fewer images, get the largest one
+    return max(images, key=lambda x: x.get('width', 0)).get('url')
+
+
+def extract_fields(artist_data: Dict, fields: Iterable[str]) -> Dict:
+    """
+    Values for the requested Artist columns from one Spotify artist object;
+    fields Spotify has nothing for are left out
+    """
+    values = {}
+    if 'genre' in fields:
+        genre = get_primary_genre(artist_data.get('genres', []))
+        if genre != "Unknown":
+            values['genre'] = genre
+    if 'profile_picture' in fields:
+        image_url = get_best_image(artist_data.get('images', []))
+        if image_url:
+            values['profile_picture'] = image_url
+    if 'popularity' in fields and artist_data.get('popularity') is not None:
+        values['popularity'] = artist_data['popularity']
+    return values
+
+
+def find_spotify_artist(client: SpotifyClient, artist: Artist,
+                        search: Optional[Callable[[str], Optional[Dict]]] = None) -> Optional[Dict]:
+    """
+    Look an artist up by its stored Spotify ID, falling back to a name search
+    (``search``, by default the client's best match)
+    """
+    if artist.spotify_id:
+        try:
+            artist_data = client.get_artist(artist.spotify_id)
+            if artist_data:
+                return artist_data
+        except Exception as e:
+            logger.warning(f"Lookup of Spotify ID {artist.spotify_id} for '{artist.name}' failed: {str(e)}")
+    return (search or client.get_best_artist_match)(artist.name)
+
+
+def link_spotify_id(artist: Artist, artist_data: Dict) -> List[str]:
+    """
+    Store the matched Spotify ID on the artist unless another artist already
+    has it, returning the extra field names to save
+    """
+    spotify_id = artist_data.get('id')
+    if not spotify_id or artist.spotify_id == spotify_id:
+        return []
+    if Artist.objects.filter(spotify_id=spotify_id).exclude(pk=artist.pk).exists():
+        return []
+    artist.spotify_id = spotify_id
+    return ['spotify_id']
+
+
+def field_missing(artist: Artist, field: str) -> bool:
+    if field == 'genre':
+        return not artist.genre or artist.genre.lower() == 'unknown'
+    if field == 'profile_picture':
+        return not artist.profile_picture or artist.profile_picture.startswith(PLACEHOLDER_PICTURE_PREFIX)
+    if field == 'popularity':
+        return not artist.popularity
+    raise ValueError(f"Unknown enrichable field: {field!r}")
+
+
+def missing_fields_filter(fields: Iterable[str]) -> Q:
+    """
+    Q matching artists missing any of ``fields`` (the same test as field_missing())
+    """
+    conditions = {
+        'genre': Q(genre__isnull=True) | Q(genre__exact='') | Q(genre__iexact='Unknown'),
+        'profile_picture': Q(profile_picture__isnull=True) | Q(profile_picture__startswith=PLACEHOLDER_PICTURE_PREFIX),
+        'popularity': Q(popularity=0),
+    }
+    query = Q()
+    for field in fields:
+        query |= conditions[field]
+    return query
+
+
+class SpotifyArtistEnricher:
+    """
+    Fill genre, profile picture and popularity from a single Spotify lookup
+    per artist, written back in one UPDATE
+    """
+
+    def __init__(self, client: SpotifyClient, fields: Iterable[str] = ENRICHABLE_FIELDS, overwrite: bool = False):
+        self.client = client
+        self.fields = tuple(fields)
+        self.overwrite = overwrite
+        self.stats = {'total': 0, 'updated': 0, 'not_found': 0, 'skipped': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def queryset(self):
+        queryset = Artist.objects.order_by('id')
+        if not self.overwrite:
+            queryset = queryset.filter(missing_fields_filter(self.fields))
+        return queryset
+
+    def enrich_artist(self, artist: Artist) -> bool:
+        fields = [field for field in self.fields if self.overwrite or field_missing(artist, field)]
+        if not fields:
+            self._count('skipped')
+            return False
+
+        artist_data = find_spotify_artist(self.client, artist)
+        if not artist_data:
+            self._count('not_found')
+            return False
+
+        # One lookup serves every selected field
+        values = extract_fields(artist_data, fields)
+        update_fields = [field for field, value in values.items() if getattr(artist, field) != value]
+
+        try:
+            for field in update_fields:
+                setattr(artist, field, values[field])
+            update_fields += link_spotify_id(artist, artist_data)
+
+            if not update_fields:
+                # Found, but Spotify has nothing new for this artist
+                self._count('skipped')
+                return False
+
+            artist.save(update_fields=[*update_fields, 'updated_at'])
+        except Exception as e:
+            logger.error(f"Error saving Spotify data for artist {artist.name}: {str(e)}")
+            self._count('errors')
+            return False
+
+        self._count('updated')
+        return True
+
+    def refresh_queryset(self):
+        return Artist.objects.filter(spotify_id__isnull=False).order_by('id')
+
+    def refresh_artists(self, artists: List[Artist]) -> int:
+        """
+        Refresh the selected fields of artists with a known Spotify ID from a
+        single multi-artist request, saved with one bulk_update. Returns how
+        many artists were looked at.
+        """
+        artists = [artist for artist in artists if artist.spotify_id]
+        if not artists:
+            return 0
+
+        try:
+            artists_data = self.client.get_artists([artist.spotify_id for artist in artists])
+        except Exception as e:
+            logger.error(f"Error fetching {len(artists)} Spotify artists: {str(e)}")
+            with self._stats_lock:
+                self.stats['errors'] += len(artists)
+            return len(artists)
+
+        updated_at = timezone.now()
+        changed = []
+        changed_fields = set()
+        for artist, artist_data in zip(artists, artists_data):
+            if not artist_data:
+                self._count('not_found')
+                continue
+            values = extract_fields(artist_data, self.fields)
+            fields = [field for field, value in values.items() if getattr(artist, field) != value]
+            if not fields:
+                self._count('skipped')
+                continue
+            for field in fields:
+                setattr(artist, field, values[field])
+            artist.updated_at = updated_at
+            changed.append(artist)
+            changed_fields.update(fields)
+
+        if changed:
+            try:
+                Artist.objects.bulk_update(changed, [*sorted(changed_fields), 'updated_at'])
+            except Exception as e:
+                logger.error(f"Error saving {len(changed)} refreshed artists: {str(e)}")
+                with self._stats_lock:
+                    self.stats['errors'] += len(changed)
+                return len(artists)
+
+            # bulk_update skips model signals
+            changed_ids = [artist.id for artist in changed]
+            invalidate_result_cache()
+            invalidate_artist_details(changed_ids)
+            refresh_prefix_index(changed_ids)
+            mark_artists_dirty(changed_ids)
+            with self._stats_lock:
+                self.stats['updated'] += len(changed)
+        return len(artists)
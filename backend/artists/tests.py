@@ -1,3 +1,283 @@
-from django.test import TestCase
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+
+from .api.pagination import ArtistCursorPagination, decode_cursor, encode_cursor, get_page_size
+from .api.search import merge_suggestions
+from .autocomplete import PrefixIndex
+from .bulk_load import CopyStream
+from .cache import ArtistDetailCache, LRUTTLCache, SearchResultCache, result_cache_key
+from .management.commands.harvest_artists import parse_retry_after
+from .search_sync import DELETE, INDEX, ArtistSyncQueue
+
+
+def es_response(raw):
+    return Response(Search(), raw)
+
+
+class MergeSuggestionsTests(SimpleTestCase):
+    def test_completion_options_read_from_source(self):
+        suggest_response = es_response({
+            'hits': {'hits': []},
+            'suggest': {'name_suggestions': [{
+                'text': 'rad',
+                'options': [
+                    {'_id': '1', 'text': 'Radiohead', '_source': {'profile_picture': 'https://img/1', 'popularity': 80}},
+                    {'_id': '2', 'text': 'Radio Moscow'},
+                ],
+            }]},
+        })
+        search_response = es_response({'hits': {'hits': [
+            {'_id': '1', '_source': {'name': 'Radiohead', 'popularity': 80}},
+            {'_id': '3', '_source': {'name': 'Rada', 'profile_picture': 'https://img/3', 'popularity': 90}},
+        ]}})
+
+        suggestions = merge_suggestions(suggest_response, search_response)
+
+        self.assertEqual([s['id'] for s in suggestions], ['3', '1', '2'])
+        self.assertEqual(suggestions[1]['profile_picture'], 'https://img/1')
+        self.assertEqual(suggestions[1]['source'], 'completion')
+        self.assertEqual(suggestions[2]['popularity'], 0)
+        self.assertEqual(suggestions[0]['source'], 'search')
+
+
+class ArtistSyncQueueTests(SimpleTestCase):
+    def test_failed_flush_keeps_pending_artists(self):
+        queue = ArtistSyncQueue(batch_size=100, flush_interval=60)
+        queue.enqueue(1)
+        queue.enqueue(2)
+
+        def requeue_during_flush(*args, **kwargs):
+            # A newer operation queued while the bulk request is in flight
+            queue.enqueue(2, DELETE)
+            raise ConnectionError('search cluster unavailable')
+
+        with mock.patch.object(queue, '_build_actions', return_value=[]), \
+                mock.patch.object(queue, '_client'), \
+                mock.patch('artists.search_sync.bulk', side_effect=requeue_during_flush):
+            with self.assertRaises(ConnectionError):
+                queue.flush()
+
+        self.assertEqual(queue._pending, {1: INDEX, 2: DELETE})
+        self.assertIsNotNone(queue._timer)
+        queue._timer.cancel()
+
+    def test_timer_flush_closes_its_connection(self):
+        queue = ArtistSyncQueue()
+        with mock.patch.object(queue, 'flush', side_effect=ConnectionError), \
+                mock.patch('artists.search_sync.connection') as connection:
+            queue._flush_on_timer()
+        connection.close.assert_called_once_with()
+
+
+class ParseRetryAfterTests(SimpleTestCase):
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after('5'), 5.0)
+
+    def test_http_date(self):
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 30, usegmt=True)), 30, delta=2)
+
+    def test_missing_or_unreadable_falls_back_to_backoff(self):
+        self.assertEqual(parse_retry_after(None), 0)
+        self.assertEqual(parse_retry_after('soon'), 0)
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex(top_k=2, precomputed_depth=3)
+        self.index.load([
+            (1, 'The Beatles', None, 90),
+            (2, 'Beach House', 'https://img/2', 70),
+            (3, 'Beck', None, 60),
+            (4, 'Bebel Gilberto', None, 95),
+        ])
+
+    def names(self, query, limit=None):
+        return [result['name'] for result in self.index.search(query, limit)]
+
+    def test_matches_name_and_later_words_by_prefix_only(self):
+        self.assertEqual(self.names('beat'), ['The Beatles'])
+        self.assertEqual(self.names('the b'), ['The Beatles'])
+        # 'beb' sorts between 'bea...' and 'bec...' but matches only its own range
+        self.assertEqual(self.names('beb'), ['Bebel Gilberto'])
+        self.assertEqual(self.names('beatles x'), [])
+        self.assertEqual(self.names('  '), [])
+
+    def test_short_prefixes_return_precomputed_top_k(self):
+        self.assertEqual(self.names('b'), ['Bebel Gilberto', 'The Beatles'])
+        self.assertEqual(self.index._top['be'], [4, 1])
+        # A limit above top_k falls back to scanning the key range
+        self.assertEqual(self.names('be', limit=4), ['Bebel Gilberto', 'The Beatles', 'Beach House', 'Beck'])
+
+    def test_results_are_search_payloads(self):
+        self.assertEqual(self.index.search('beach'), [
+            {'id': '2', 'name': 'Beach House', 'profile_picture': 'https://img/2', 'popularity': 70},
+        ])
+
+    def test_upsert_renames_and_reranks(self):
+        self.index.upsert(3, 'Björk', None, 99)
+
+        self.assertEqual(self.names('beck'), [])
+        self.assertEqual(self.names('bjork'), ['Björk'])
+        self.assertEqual(self.names('b'), ['Björk', 'Bebel Gilberto'])
+        self.assertEqual(self.names('be'), ['Bebel Gilberto', 'The Beatles'])
+
+    def test_remove_updates_top_k(self):
+        self.index.remove(4)
+        self.index.remove(404)
+
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.names('b'), ['The Beatles', 'Beach House'])
+        self.assertEqual(self.names('beb'), [])
+        self.assertNotIn('beb', self.index._top)
+
+
+class LRUTTLCacheTests(SimpleTestCase):
+    def test_entries_expire_after_ttl(self):
+        cache = LRUTTLCache(max_entries=10, ttl=30)
+        with mock.patch('artists.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with mock.patch('artists.cache.time.monotonic', return_value=129.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('artists.cache.time.monotonic', return_value=131.0):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUTTLCache(max_entries=2, ttl=30)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.evictions, 1)
+
+
+@override_settings(CACHES={'results': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}})
+class SearchResultCacheTests(SimpleTestCase):
+    def make_cache(self):
+        return SearchResultCache(local_max_entries=10, local_ttl=30, shared_alias='results', shared_ttl=300,
+                                 generation_check_interval=0)
+
+    def tearDown(self):
+        from django.core.cache import caches
+        caches['results'].clear()
+
+    def test_tiers(self):
+        cache, other_process = self.make_cache(), self.make_cache()
+        compute = mock.Mock(return_value={'results': []})
+
+        self.assertEqual(cache.get_or_compute('search', 'beck', compute), ({'results': []}, 'miss'))
+        self.assertEqual(cache.get_or_compute('search', 'beck', compute)[1], 'local')
+        self.assertEqual(other_process.get_or_compute('search', 'beck', compute)[1], 'shared')
+        self.assertEqual(compute.call_count, 1)
+
+    def test_invalidate_retires_entries_in_every_process(self):
+        cache, other_process = self.make_cache(), self.make_cache()
+        cache.set('search', 'beck', 'old')
+        self.assertEqual(other_process.get('search', 'beck'), 'old')
+
+        cache.invalidate()
+
+        self.assertIsNone(cache.get('search', 'beck'))
+        self.assertIsNone(other_process.get('search', 'beck'))
+
+    def test_keys(self):
+        self.assertEqual(result_cache_key('search', 'AC DC'), result_cache_key('search', 'acdc'))
+        self.assertNotEqual(result_cache_key('search', 'Radiohead'), result_cache_key('search', 'radiohead'))
+        self.assertNotEqual(result_cache_key('autocomplete', 'AC DC'), result_cache_key('autocomplete', 'acdc'))
+
+
+class KeysetPaginationTests(SimpleTestCase):
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(80, 12345)), (80, 12345))
+
+    def test_malformed_cursors(self):
+        for cursor in ['not base64!', encode_cursor('x', 1), 'MQ==', 'é']:
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(get_page_size({}, 12, 100), 12)
+        self.assertEqual(get_page_size({'limit': '500'}, 12, 100), 100)
+        self.assertEqual(get_page_size({'limit': '0'}, 12, 100), 1)
+        self.assertEqual(get_page_size({'limit': 'ten'}, 12, 100), 12)
+
+    def paginate(self, rows, limit):
+        pagination = ArtistCursorPagination()
+        request = mock.Mock(query_params={'limit': str(limit)})
+        # keyset_queryset is asked for limit + 1 rows; hand back at most that many
+        with mock.patch('artists.api.pagination.keyset_queryset', return_value=rows[:limit + 1]):
+            page = pagination.paginate_queryset(None, request)
+        return pagination, page
+
+    def test_extra_row_means_next_page(self):
+        rows = [{'id': 9, 'popularity': 90}, {'id': 7, 'popularity': 90}, {'id': 8, 'popularity': 50}]
+        pagination, page = self.paginate(rows, limit=2)
+
+        self.assertEqual(page, rows[:2])
+        self.assertTrue(pagination.has_next)
+        self.assertEqual(decode_cursor(pagination.next_cursor), (90, 7))
+
+    def test_last_page(self):
+        rows = [{'id': 9, 'popularity': 90}, {'id': 7, 'popularity': 90}]
+        pagination, page = self.paginate(rows, limit=2)
+
+        self.assertEqual(page, rows)
+        self.assertFalse(pagination.has_next)
+        self.assertIsNone(pagination.next_cursor)
+
+
+@override_settings(CACHES={'results': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}})
+class ArtistDetailCacheTests(SimpleTestCase):
+    def tearDown(self):
+        from django.core.cache import caches
+        caches['results'].clear()
+
+    def test_misses_read_the_primary_only_after_a_write(self):
+        cache = ArtistDetailCache(local_max_entries=10, local_ttl=30, shared_alias='results', shared_ttl=300)
+        load = mock.Mock(return_value={'id': 1})
+
+        cache.get_or_load(1, load)
+        cache.invalidate([1])
+        cache.get_or_load(1, load)
+
+        self.assertEqual(load.call_args_list, [mock.call(False), mock.call(True)])
+        self.assertEqual(cache.stats()['primary_loads'], 1)
+
+
+class CopyStreamTests(SimpleTestCase):
+    def row(self, **values):
+        return SimpleNamespace(**{'musicbrainz_id': None, 'spotify_id': None, 'name': '', 'genre': None,
+                            'profile_picture': None, 'location': None, **values})
+
+    def test_escapes_copy_text_format(self):
+        stream = CopyStream([self.row(name='Tab\there', genre='Line\nbreak\r', location='C:\\dir')])
+
+        self.assertEqual(
+            stream.read(),
+            '\\N\t\\N\tTab\\there\tLine\\nbreak\\r\t\\N\tC:\\\\dir\n',
+        )
+        self.assertEqual(stream.rows, 1)
+
+    def test_sized_reads_return_every_row_once(self):
+        rows = [self.row(name=f'Artist {i}', musicbrainz_id=f'00000000-0000-0000-0000-{i:012d}') for i in range(50)]
+        expected = CopyStream(rows).read()
+
+        stream = CopyStream(rows)
+        chunks = []
+        while chunk := stream.read(7):
+            self.assertLessEqual(len(chunk), 7)
+            chunks.append(chunk)
+
+        self.assertEqual(''.join(chunks), expected)
+        self.assertEqual(stream.rows, 50)
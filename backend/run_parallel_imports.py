@@ -4,42 +4,26 @@ import os
 
 def run_parallel_imports(total_artists=140000, num_processes=4, batch_size=100):
     """
-    Run multiple artist import processes in parallel
+    Run the artist import with parallel requests.
+
+    Separate fetch_artists processes each throttled themselves, so together
+    they exceeded the MusicBrainz rate limit; harvest_artists runs the
+    workers in one process that shares a single rate budget.
     """
-    print(f"Starting {num_processes} parallel import processes for {total_artists} artists...")
-    
-    # Calculate artists per process
-    artists_per_process = total_artists // num_processes
-    
-    processes = []
-    
-    for i in range(num_processes):
-        start_offset = i * artists_per_process
-        limit = artists_per_process if i < num_processes - 1 else total_artists - start_offset
-        
-        # Build the command
-        cmd = [
-            sys.executable,
-            "manage.py",
-            "fetch_artists",
-            "--limit", str(limit),
-            "--batch-size", str(batch_size),
-            "--start-offset", str(start_offset),
-            "--process-id", str(i+1),
-            "--rate-limit", "0.5"  # Try a slightly faster rate limit
-        ]
-        
-        # Start the process
-        print(f"Starting process {i+1} with offset {start_offset}, limit {limit}")
-        process = subprocess.Popen(cmd)
-        processes.append(process)
+    print(f"Starting import of {total_artists} artists with {num_processes} concurrent requests...")
     
-    # Wait for all processes to complete
-    for i, process in enumerate(processes):
-        process.wait()
-        print(f"Process {i+1} completed with exit code {process.returncode}")
+    # Build the command
+    cmd = [
+        sys.executable,
+        "manage.py",
+        "harvest_artists",
+        "--limit", str(total_artists),
+        "--batch-size", str(batch_size),
+        "--concurrency", str(num_processes),
+    ]
     
-    print("All import processes completed!")
+    process = subprocess.run(cmd)
+    print(f"Import completed with exit code {process.returncode}")
 
 if __name__ == "__main__":
     # Get command line arguments
@@ -47,4 +31,4 @@ if __name__ == "__main__":
     num_processes = int(sys.argv[2]) if len(sys.argv) > 2 else 4
     batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 100
     
-    run_parallel_imports(total_artists, num_processes, batch_size)
\ No newline at end of file
+    run_parallel_imports(total_artists, num_processes, batch_size)
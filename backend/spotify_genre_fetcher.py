@@ -24,11 +24,16 @@ logging.basicConfig(
 logger = logging.getLogger("spotify_genre_fetcher")
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'star_seeker.settings')  
+# Batch search index updates instead of one ES request per saved artist
+os.environ.setdefault('ARTIST_SEARCH_SYNC_MODE', 'deferred')
 django.setup()
 
 load_dotenv()
 
 from artists.models import Artist 
+from artists.search_sync import flush_search_sync
+from artists.spotify_client import SpotifyClient
+from artists.spotify_enrichment import find_spotify_artist, get_primary_genre, link_spotify_id
 
 class SpotifyGenreFetcher:
     """Class to fetch artist genres from Spotify API and update database."""
@@ -49,6 +54,8 @@ class SpotifyGenreFetcher:
         self.token_expiry = 0
         self.batch_size = batch_size
         self.session = requests.Session()
+        # Looks artists up by stored Spotify ID
+        self.spotify_client = SpotifyClient(client_id, client_secret)
         self.default_headers = {
             'Content-Type': 'application/json',
         }
@@ -198,12 +205,7 @@ class SpotifyGenreFetcher:
         Returns:
             Primary genre or 'Unknown' if no genres available
         """
-        if not genres:
-            return "Unknown"
-        
-        # Simply return the first genre as the primary genre
-        # This can be enhanced with better genre selection logic if needed
-        return genres[0].title()  # Capitalize the genre name
+        return get_primary_genre(genres)
     
     def process_artist(self, artist: Artist) -> bool:
         """
@@ -220,7 +222,7 @@ class SpotifyGenreFetcher:
             self.stats['skipped'] += 1
             return False
         
-        artist_data = self.search_artist(artist.name)
+        artist_data = find_spotify_artist(self.spotify_client, artist, search=self.search_artist)
         if not artist_data:
             self.stats['not_found'] += 1
             return False
@@ -232,7 +234,7 @@ class SpotifyGenreFetcher:
         # Update the artist model
         try:
             artist.genre = primary_genre
-            artist.save(update_fields=['genre'])
+            artist.save(update_fields=['genre', 'updated_at', *link_spotify_id(artist, artist_data)])
             self.stats['updated'] += 1
             
             # Save checkpoint after processing each artist
@@ -311,6 +313,8 @@ class SpotifyGenreFetcher:
                     logger.error(f"Batch processing error: {str(e)}")
                     self.stats['errors'] += 1
         
+        flush_search_sync()
+        
         logger.info(f"Processed {total_artists} artists")
         logger.info(f"Stats: {self.stats}")
         return self.stats
@@ -23,11 +23,16 @@ logging.basicConfig(
 logger = logging.getLogger("spotify_image_fetcher")
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'star_seeker.settings')  
+# Batch search index updates instead of one ES request per saved artist
+os.environ.setdefault('ARTIST_SEARCH_SYNC_MODE', 'deferred')
 django.setup()
 
 load_dotenv()
 
 from artists.models import Artist 
+from artists.search_sync import flush_search_sync
+from artists.spotify_client import SpotifyClient
+from artists.spotify_enrichment import find_spotify_artist, get_best_image, link_spotify_id
 
 class SpotifyImageFetcher:
     """Class to fetch artist images from Spotify API and update database."""
@@ -47,6 +52,8 @@ class SpotifyImageFetcher:
         self.token_expiry = 0
         self.batch_size = batch_size
         self.session = requests.Session()
+        # Looks artists up by stored Spotify ID
+        self.spotify_client = SpotifyClient(client_id, client_secret)
         self.default_headers = {
             'Content-Type': 'application/json',
         }
@@ -143,17 +150,7 @@ class SpotifyImageFetcher:
         Returns:
             URL of the best image (medium size preferred) or None if no images
         """
-        if not images:
-            return None
-            
-        # Sort images by size (width), getting medium-sized images ideally
-        # Spotify usually provides images in 3 sizes, we prefer the middle one
-        if len(images) >= 3:
-            sorted_images = sorted(images, key=lambda x: x.get('width', 0))
-            return sorted_images[len(images) // 2]['url']  # Get middle-sized image
-        
-        # If there are fewer images, get the largest one
-        return max(images, key=lambda x: x.get('width', 0)).get('url')
+        return get_best_image(images)
     
     def process_artist(self, artist: Artist) -> bool:
         """
@@ -170,7 +167,7 @@ class SpotifyImageFetcher:
             self.stats['skipped'] += 1
             return False
         
-        artist_data = self.search_artist(artist.name)
+        artist_data = find_spotify_artist(self.spotify_client, artist, search=self.search_artist)
         if not artist_data:
             self.stats['not_found'] += 1
             return False
@@ -183,7 +180,7 @@ class SpotifyImageFetcher:
         # Update the artist model
         try:
             artist.profile_picture = image_url
-            artist.save(update_fields=['profile_picture'])
+            artist.save(update_fields=['profile_picture', 'updated_at', *link_spotify_id(artist, artist_data)])
             self.stats['updated'] += 1
             return True
         except Exception as e:
@@ -252,6 +249,8 @@ class SpotifyImageFetcher:
                     logger.error(f"Batch processing error: {str(e)}")
                     self.stats['errors'] += 1
         
+        flush_search_sync()
+        
         logger.info(f"Processed {total_artists} artists")
         logger.info(f"Stats: {self.stats}")
         return self.stats
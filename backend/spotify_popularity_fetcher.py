@@ -23,11 +23,16 @@ logging.basicConfig(
 logger = logging.getLogger("spotify_popularity_fetcher")
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'star_seeker.settings')  
+# Batch search index updates instead of one ES request per saved artist
+os.environ.setdefault('ARTIST_SEARCH_SYNC_MODE', 'deferred')
 django.setup()
 
 load_dotenv()
 
 from artists.models import Artist 
+from artists.search_sync import flush_search_sync
+from artists.spotify_client import SpotifyClient
+from artists.spotify_enrichment import find_spotify_artist, link_spotify_id
 
 class SpotifyPopularityFetcher:
     """Class to fetch artist popularity from Spotify API and update database."""
@@ -48,6 +53,8 @@ class SpotifyPopularityFetcher:
         self.token_expiry = 0
         self.batch_size = batch_size
         self.session = requests.Session()
+        # Looks artists up by stored Spotify ID
+        self.spotify_client = SpotifyClient(client_id, client_secret)
         self.default_headers = {
             'Content-Type': 'application/json',
         }
@@ -202,7 +209,7 @@ class SpotifyPopularityFetcher:
             self.stats['skipped'] += 1
             return False
         
-        artist_data = self.search_artist(artist.name)
+        artist_data = find_spotify_artist(self.spotify_client, artist, search=self.search_artist)
         if not artist_data:
             self.stats['not_found'] += 1
             return False
@@ -213,7 +220,7 @@ class SpotifyPopularityFetcher:
         # Update the artist model
         try:
             artist.popularity = popularity
-            artist.save(update_fields=['popularity'])
+            artist.save(update_fields=['popularity', 'updated_at', *link_spotify_id(artist, artist_data)])
             self.stats['updated'] += 1
             
             # Save checkpoint after processing each artist
@@ -288,6 +295,8 @@ class SpotifyPopularityFetcher:
                     logger.error(f"Batch processing error: {str(e)}")
                     self.stats['errors'] += 1
         
+        flush_search_sync()
+        
         logger.info(f"Processed {total_artists} artists")
         logger.info(f"Stats: {self.stats}")
         return self.stats
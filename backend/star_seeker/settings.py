@@ -64,6 +64,11 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5173",
 ]
 
+CORS_EXPOSE_HEADERS = [
+    'X-ES-Calls',
+    'X-Cache',
+]
+
 
 
 
@@ -102,6 +107,57 @@ DATABASES = {
     }
 }
 
+# Reuse database connections instead of opening one per request. By default
+# each process keeps a psycopg 3 connection pool (Django's native pooling);
+# requests borrow a connection and hand it back when they finish, which
+# also holds under ASGI, where async views run ORM calls on executor
+# threads. POSTGRES_POOL_MAX_SIZE=0 switches to per-thread persistent
+# connections (POSTGRES_CONN_MAX_AGE), e.g. behind pgbouncer.
+POSTGRES_POOL_MAX_SIZE = int(os.getenv('POSTGRES_POOL_MAX_SIZE', 20))
+if POSTGRES_POOL_MAX_SIZE:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('POSTGRES_POOL_MIN_SIZE', 2)),
+            'max_size': POSTGRES_POOL_MAX_SIZE,
+            # Seconds a request waits for a free connection before erroring
+            'timeout': int(os.getenv('POSTGRES_POOL_TIMEOUT', 10)),
+        },
+    }
+else:
+    # Check kept-open connections before reuse so a dropped one is replaced
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('POSTGRES_CONN_MAX_AGE', 600))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Read replicas for read-only API traffic, e.g. POSTGRES_REPLICA_HOSTS=replica1,replica2
+# (see artists/db_routers.py). Without any, all reads stay on the primary.
+DATABASE_REPLICAS = []
+for position, replica_host in enumerate(filter(None, os.getenv('POSTGRES_REPLICA_HOSTS', '').split(',')), start=1):
+    alias = f'replica{position}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': replica_host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['artists.db_routers.ReadReplicaRouter']
+
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+if os.getenv('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    }
 
 
 # Password validation
@@ -146,9 +202,56 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Spotify API credentials (client credentials flow)
+SPOTIFY_CLIENT_ID = os.getenv('SPOTIFY_CLIENT_ID')
+SPOTIFY_CLIENT_SECRET = os.getenv('SPOTIFY_CLIENT_SECRET')
+
 # Elasticsearch Configuration
 ELASTICSEARCH_DSL = {
     'default': {
         'hosts': 'http://localhost:9200'
     },
-}
\ No newline at end of file
+}
+
+# How Artist saves reach the search index (see artists/search_sync.py):
+# 'realtime' indexes on every save, 'deferred' buffers dirty artists and
+# bulk-indexes them every BATCH_SIZE artists or FLUSH_INTERVAL seconds
+ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = 'artists.search_sync.ArtistSyncSignalProcessor'
+ARTIST_SEARCH_SYNC = {
+    'MODE': os.getenv('ARTIST_SEARCH_SYNC_MODE', 'realtime'),
+    'BATCH_SIZE': int(os.getenv('ARTIST_SEARCH_SYNC_BATCH_SIZE', 500)),
+    'FLUSH_INTERVAL': float(os.getenv('ARTIST_SEARCH_SYNC_FLUSH_INTERVAL', 5)),
+}
+
+# Prefix mapping for ArtistDocument.name, picked when the index is built:
+# 'edge_ngram' or 'search_as_you_type' (compare with `manage.py compare_name_mappings`)
+ARTIST_NAME_PREFIX_MAPPING = os.getenv('ARTIST_NAME_PREFIX_MAPPING', 'edge_ngram')
+
+# Autocomplete backend: 'elasticsearch' or 'prefix' (in-process prefix index, see artists/autocomplete.py)
+ARTIST_AUTOCOMPLETE = {
+    'BACKEND': os.getenv('ARTIST_AUTOCOMPLETE_BACKEND', 'elasticsearch'),
+    'SNAPSHOT_PATH': os.getenv('ARTIST_AUTOCOMPLETE_SNAPSHOT', str(BASE_DIR / 'autocomplete_snapshot.json')),
+    'TOP_K': 10,
+    'PRECOMPUTED_DEPTH': 3,
+    'RELOAD_INTERVAL': 60,
+}
+
+# Search/autocomplete result cache: per-process LRU in front of a shared Django cache (see artists/cache.py)
+ARTIST_RESULT_CACHE = {
+    'LOCAL_MAX_ENTRIES': 2048,
+    'LOCAL_TTL': 30,
+    'SHARED_ALIAS': 'default',
+    'SHARED_TTL': 300,
+    'GENERATION_CHECK_INTERVAL': 1.0,
+}
+
+# Per-artist detail payload cache (see ArtistDetailCache in artists/cache.py)
+ARTIST_DETAIL_CACHE = {
+    'LOCAL_MAX_ENTRIES': 5000,
+    'LOCAL_TTL': 10,
+    'SHARED_ALIAS': 'default',
+    'SHARED_TTL': 3600,
+    # Seconds after a write during which misses read the primary rather
+    # than a replica; keep it above the worst expected replica lag
+    'PRIMARY_READ_WINDOW': 30,
+}
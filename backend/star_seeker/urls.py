@@ -20,4 +20,6 @@ from django.urls import path,include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('artists.api.urls')),
+    # Async variants for the ASGI stack (star_seeker.asgi)
+    path('api/async/', include('artists.api.async_urls')),
 ]
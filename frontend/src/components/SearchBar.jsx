@@ -76,13 +76,13 @@ function SearchBar({ setSelectedArtist, setSearchedArtists, onClearSearch }) {
     
     try {
       const response = await api.get('/artists/search/', {
-        params: { query: searchTerm, page: 1, limit: 12 }
+        params: { query: searchTerm, limit: 12 }
       });
       console.log('searched', response);
       
       // Set the search results in parent component with query and pagination info
-      const { results, has_next } = response.data;
-      setSearchedArtists(results, searchTerm, has_next);
+      const { results, has_next, next_cursor } = response.data;
+      setSearchedArtists(results, searchTerm, has_next, next_cursor);
       setSuggestions([]); // Close autocomplete dropdown
     } catch (error) {
       console.error('Error performing search:', error);
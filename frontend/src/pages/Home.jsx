@@ -17,8 +17,8 @@ function Home() {
   const [isSearchActive, setIsSearchActive] = useState(false);
   
   // States for pagination and infinite scrolling
-  const [page, setPage] = useState(1);
-  const [searchPage, setSearchPage] = useState(1);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [searchCursor, setSearchCursor] = useState(null);
   const [hasMore, setHasMore] = useState(true);
   const [searchHasMore, setSearchHasMore] = useState(true);
   const [isLoading, setIsLoading] = useState(false);
@@ -30,25 +30,25 @@ function Home() {
   }, []);
   
   // Fetch initial artists data
-  const fetchInitialArtists = async (pageNum = 1) => {
+  const fetchInitialArtists = async (cursor = null) => {
     if (isLoading) return;
     
     setIsLoading(true);
     try {
       const response = await api.get('/artists/', {
-        params: { page: pageNum, limit: 12 }
+        params: cursor ? { cursor, limit: 12 } : { limit: 12 }
       });
       
-      const { results, has_next } = response.data;
+      const { results, has_next, next_cursor } = response.data;
       
-      if (pageNum === 1) {
+      if (!cursor) {
         setInitialArtists(results);
       } else {
         setInitialArtists(prev => [...prev, ...results]);
       }
       
       setHasMore(has_next);
-      setPage(pageNum + 1);
+      setNextCursor(next_cursor);
     } catch (error) {
       console.error('Error fetching artists:', error);
     } finally {
@@ -79,13 +79,13 @@ function Home() {
         if (isSearchActive && searchHasMore) {
           loadMoreSearchResults();
         } else if (!isSearchActive && hasMore) {
-          fetchInitialArtists(page);
+          fetchInitialArtists(nextCursor);
         }
       }
     });
     
     if (node) observer.current.observe(node);
-  }, [isLoading, isSearchActive, searchHasMore, hasMore, page]);
+  }, [isLoading, isSearchActive, searchHasMore, hasMore, nextCursor]);
   
   // Load more search results for infinite scrolling
   const loadMoreSearchResults = async () => {
@@ -94,14 +94,14 @@ function Home() {
     setIsLoading(true);
     try {
       const response = await api.get('/artists/search/', {
-        params: { query: searchQuery.current, page: searchPage, limit: 12 }
+        params: { query: searchQuery.current, cursor: searchCursor, limit: 12 }
       });
       
-      const { results, has_next } = response.data;
+      const { results, has_next, next_cursor } = response.data;
       
       setSearchedArtists(prev => [...prev, ...results]);
       setSearchHasMore(has_next);
-      setSearchPage(searchPage + 1);
+      setSearchCursor(next_cursor);
     } catch (error) {
       console.error('Error loading more search results:', error);
     } finally {
@@ -113,11 +113,11 @@ function Home() {
   const searchQuery = useRef('');
   
   // Handle search state
-  const handleSearchResults = (results, query, hasMore = true) => {
+  const handleSearchResults = (results, query, hasMore = true, cursor = null) => {
     searchQuery.current = query;
     setSearchedArtists(results);
     setIsSearchActive(true);
-    setSearchPage(2); // Reset search pagination
+    setSearchCursor(cursor); // Reset search pagination
     setSearchHasMore(hasMore);
   };
   